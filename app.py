@@ -1,7 +1,11 @@
 from flask import Flask, jsonify, request, send_from_directory
+import click
 import os
 from dotenv import load_dotenv
 from models.models import db
+from services.events import broker
+from services.log import init_logging
+from services.notifications import mail
 from flask_login import LoginManager
 from flask_cors import CORS
 
@@ -43,9 +47,34 @@ app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SAMESITE'] = None  # Allow cross-origin session cookies
 app.config['SESSION_COOKIE_DOMAIN'] = None   # Allow localhost domains
 
+# Users allowed to use the admin moderation endpoints (comma-separated); empty means no admins
+app.config['ADMIN_EMAILS'] = [email.strip() for email in
+                              os.getenv('ADMIN_EMAILS', '').split(',') if email.strip()]
+
+# Live updates: 'memory' (single process) or 'postgres' (LISTEN/NOTIFY across workers)
+app.config['EVENTS_BACKEND'] = os.getenv('EVENTS_BACKEND', 'memory')
+
+# Logging: JSON lines written by a background thread (see services/log.py)
+app.config['LOG_LEVEL'] = os.getenv('LOG_LEVEL', 'INFO')
+app.config['LOG_DEBUG_SAMPLE_RATE'] = float(os.getenv('LOG_DEBUG_SAMPLE_RATE', '1.0'))
+
+# Mail for notification digests, sent by the job worker (see services/notifications.py).
+# Defaults point at a local SMTP stand-in: python -m aiosmtpd -n -l localhost:1025
+app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'localhost')
+app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 1025))
+app.config['MAIL_USERNAME'] = os.getenv('MAIL_USERNAME')
+app.config['MAIL_PASSWORD'] = os.getenv('MAIL_PASSWORD')
+app.config['MAIL_USE_TLS'] = os.getenv('MAIL_USE_TLS', 'False').lower() == 'true'
+app.config['MAIL_DEFAULT_SENDER'] = os.getenv('MAIL_DEFAULT_SENDER', 'noreply@sunoaid.local')
+app.config['MAIL_TIMEOUT_SECONDS'] = float(os.getenv('MAIL_TIMEOUT_SECONDS', 60))  # must stay below the job lock timeout (10 min)
+app.config['NOTIFY_DIGEST_SECONDS'] = int(os.getenv('NOTIFY_DIGEST_SECONDS', 300))
+
 # Initialize extensions
+init_logging(app)
 db.init_app(app)
+mail.init_app(app)
 login_manager.init_app(app)
+broker.init_app(app)
 login_manager.login_view = 'auth_api.login'
 
 # CORS configuration
@@ -62,6 +91,8 @@ from routes.issues_api import issues_api_bp
 from routes.locations_api import locations_api_bp
 from routes.upload_api import upload_api_bp
 from routes.admin_api_bp import admin_api_bp
+from routes.events_api import events_api_bp
+from routes.analytics_api import analytics_api_bp
 
 # Register blueprints
 app.register_blueprint(auth_api_bp, url_prefix='/api/auth')
@@ -69,6 +100,8 @@ app.register_blueprint(issues_api_bp, url_prefix='/api/issues')
 app.register_blueprint(locations_api_bp, url_prefix='/api/locations')
 app.register_blueprint(upload_api_bp, url_prefix='/api/upload')
 app.register_blueprint(admin_api_bp, url_prefix='/api/admin')
+app.register_blueprint(events_api_bp, url_prefix='/api/events')
+app.register_blueprint(analytics_api_bp, url_prefix='/api/analytics')
 
 @app.route('/api/health')
 def health_check():
@@ -88,6 +121,37 @@ def get_config():
         "version": "1.0.0"
     })
 
+@app.cli.command('refresh-hot-scores')
+@click.option('--days', type=int, default=None, help='Only issues created in the last N days')
+def refresh_hot_scores_command(days):
+    """Recompute stored hot scores (backfill, or after changing the ranking weights)"""
+    from datetime import datetime, timedelta
+    from services.ranking import refresh_all_hot_scores
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    updated = refresh_all_hot_scores(since=since)
+    print(f"✅ Refreshed hot scores for {updated} issues")
+
+@app.cli.command('backfill-geo-cells')
+def backfill_geo_cells_command():
+    """Assign duplicate-detection grid cells to issues created before geo_cell existed"""
+    from services.duplicates import backfill_geo_cells
+    updated = backfill_geo_cells()
+    print(f"✅ Assigned geo cells to {updated} issues")
+
+@app.cli.command('rebuild-analytics')
+def rebuild_analytics_command():
+    """Rebuild the daily analytics rollups from the issues table"""
+    from services.analytics import rebuild_rollups
+    rebuild_rollups()
+    print("✅ Analytics rollups rebuilt")
+
+@app.cli.command('run-worker')
+@click.option('--once', is_flag=True, help='Exit when no jobs are due instead of polling')
+def run_worker_command(once):
+    """Process background jobs (notification emails and other deferred work)"""
+    from services.jobs import run_worker
+    run_worker(once=once)
+
 if __name__ == '__main__':
     with app.app_context():
         try:
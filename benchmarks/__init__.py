@@ -0,0 +1,5 @@
+"""Benchmark suite for the SunoAid API.
+
+- `benchmarks.datagen` seeds a database with a synthetic, reproducible dataset
+- `benchmarks.run` drives the API and records latency / query counts per endpoint
+"""
@@ -0,0 +1,447 @@
+"""Seeded synthetic dataset generator for benchmarking the SunoAid API.
+
+Usage:
+    python -m benchmarks.datagen --scale 10k --seed 42
+    python -m benchmarks.datagen --scale 100k --database-url postgresql://.../sunoaid_bench
+
+The scale is the number of issues. Users, votes and comments are derived
+from it so the dataset keeps the same shape at every size:
+
+    scale   users    issues   votes (~)  comments (~)
+    10k     1,000    10,000   30,000     20,000
+    100k    10,000   100,000  300,000    200,000
+    1m      100,000  1,000,000 3,000,000 2,000,000
+
+Rows are inserted in batches with explicit IDs (appended after the current
+max id of each table). The same seed produces the same rows; timestamps are
+relative to the day the generator runs.
+Point it at a dedicated database - it writes a lot of data.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+SCALES = {
+    '10k': 10_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+
+# Every generated user gets this password so the runner can log in as them
+BENCH_PASSWORD = 'bench'
+BENCH_EMAIL_DOMAIN = 'bench.sunoaid.local'
+
+BATCH_SIZE = 5000
+
+STATUSES = [('open', 50), ('in_progress', 20), ('resolved', 25), ('closed', 5)]
+SEVERITIES = [('low', 30), ('medium', 40), ('high', 20), ('critical', 10)]
+
+DEFAULT_CATEGORIES = [
+    ('Infrastructure', 'Roads, bridges, utilities', '#3B82F6', 'construction'),
+    ('Sanitation', 'Waste management, cleanliness', '#10B981', 'trash'),
+    ('Water Supply', 'Water shortage, quality issues', '#06B6D4', 'droplet'),
+    ('Electricity', 'Power outages, electrical issues', '#F59E0B', 'zap'),
+    ('Transportation', 'Public transport, traffic', '#8B5CF6', 'bus'),
+    ('Healthcare', 'Medical facilities, health services', '#EF4444', 'heart'),
+    ('Education', 'Schools, educational resources', '#EC4899', 'book'),
+    ('Environment', 'Pollution, environmental concerns', '#22C55E', 'leaf'),
+    ('Security', 'Safety, crime, security issues', '#6B7280', 'shield'),
+    ('Other', 'Other civic issues', '#9CA3AF', 'help-circle'),
+]
+
+FIRST_NAMES = ['Ali', 'Sara', 'Omar', 'Ayesha', 'Bilal', 'Fatima', 'Hamza', 'Zainab', 'Usman', 'Hina',
+               'John', 'Maria', 'Wei', 'Priya', 'Lucas', 'Emma', 'Noah', 'Olivia', 'Yusuf', 'Mei']
+LAST_NAMES = ['Khan', 'Ahmed', 'Malik', 'Hussain', 'Sheikh', 'Raza', 'Smith', 'Garcia', 'Chen', 'Patel',
+              'Silva', 'Brown', 'Nguyen', 'Kumar', 'Ali', 'Qureshi', 'Martin', 'Lee', 'Iqbal', 'Shah']
+STREETS = ['Main Street', 'Park Avenue', 'Mall Road', 'Canal Road', 'Station Road', 'College Road',
+           'Market Street', 'Lake View', 'Hill Road', 'Airport Road', 'Ring Road', 'River Street']
+
+# (title template, description fragments) per category name; {street} is filled in
+ISSUE_TEMPLATES = {
+    'Infrastructure': [
+        ('Pothole on {street}', ['Large pothole damaging cars', 'deep hole near the intersection',
+                                 'water collects in it after rain', 'two bikes have already fallen']),
+        ('Broken footpath near {street}', ['tiles are cracked and loose', 'pedestrians walk on the road',
+                                           'dangerous for children and elderly', 'reported months ago']),
+    ],
+    'Sanitation': [
+        ('Garbage pile at {street}', ['waste not collected for a week', 'bad smell in the whole block',
+                                      'stray dogs spreading the trash', 'attracting flies and mosquitoes']),
+        ('Overflowing bin on {street}', ['bin overflows every evening', 'collection truck skips this lane',
+                                         'plastic bags blowing into houses']),
+    ],
+    'Water Supply': [
+        ('Water leak on {street}', ['pipe leaking under the road', 'clean water wasted all day',
+                                    'road surface is getting damaged', 'low pressure in nearby homes']),
+        ('Dirty tap water near {street}', ['water is brown and smells', 'several families fell ill',
+                                           'started after the pipeline repair']),
+    ],
+    'Electricity': [
+        ('Streetlight out on {street}', ['light has been off for weeks', 'area is unsafe at night',
+                                         'several lights in a row are dead']),
+        ('Exposed wires at {street}', ['live wires hanging from the pole', 'sparks during rain',
+                                       'children play right next to it']),
+    ],
+    'Transportation': [
+        ('Traffic signal not working at {street}', ['signal stuck on red', 'constant jams at rush hour',
+                                                    'near misses every day']),
+        ('Bus stop shelter damaged on {street}', ['roof is broken', 'no seating left',
+                                                  'commuters wait in the sun']),
+    ],
+    'Healthcare': [
+        ('Clinic closed early near {street}', ['staff leave before noon', 'patients turned away',
+                                               'no doctor on weekends']),
+    ],
+    'Education': [
+        ('School boundary wall collapsed on {street}', ['wall fell after the storm', 'students at risk',
+                                                        'gate cannot be locked']),
+    ],
+    'Environment': [
+        ('Trees cut illegally near {street}', ['old trees cut overnight', 'no permit shown',
+                                               'green belt is disappearing']),
+        ('Smoke from burning waste at {street}', ['waste burnt every night', 'residents have breathing problems']),
+    ],
+    'Security': [
+        ('Street crime rising on {street}', ['phones snatched near the market', 'no police patrol at night',
+                                             'dark corners need lighting']),
+    ],
+    'Other': [
+        ('Stray animals on {street}', ['packs of stray dogs', 'people bitten recently',
+                                       'children afraid to walk to school']),
+    ],
+}
+
+COMMENT_FRAGMENTS = ['Same problem in our street too.', 'This has been going on for months.',
+                     'Any update from the authorities?', 'I reported this last week as well.',
+                     'Thank you for raising this.', 'Still not fixed as of today.',
+                     'The crew came but left without fixing it.', 'Please prioritise this, it is dangerous.']
+
+
+def weighted_choice(rng, choices):
+    total = sum(weight for _, weight in choices)
+    pick = rng.uniform(0, total)
+    upto = 0
+    for value, weight in choices:
+        upto += weight
+        if pick <= upto:
+            return value
+    return choices[-1][0]
+
+
+def parse_scale(value):
+    """Accept a named scale ('10k', '100k', '1m') or a plain integer issue count"""
+    value = str(value).lower()
+    if value in SCALES:
+        return SCALES[value]
+    try:
+        return int(value.replace('_', ''))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Unknown scale: {value} (use one of {', '.join(SCALES)} or a number)")
+
+
+class DatasetGenerator:
+    """Generates and bulk-inserts a reproducible dataset for a given seed and scale"""
+
+    def __init__(self, db, scale, seed=42, now=None):
+        self.db = db
+        self.scale = scale
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Pin "now" to the day so reruns with the same seed produce identical timestamps
+        self.now = now or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+
+        self.n_users = max(50, scale // 10)
+        self.n_issues = scale
+        self.avg_votes = 3
+        self.avg_comments = 2
+
+        self.user_ids = []
+        self.category_ids = []
+        self.category_names = {}
+        self.districts = []  # (location_id, lat, lng)
+
+    # --- helpers ---
+
+    def _next_id(self, table):
+        max_id = self.db.session.execute(self.db.text(f'SELECT COALESCE(MAX(id), 0) FROM {table}')).scalar()
+        return max_id + 1
+
+    def _insert(self, model, rows):
+        if rows:
+            self.db.session.execute(model.__table__.insert(), rows)
+
+    def _sync_sequences(self, tables):
+        """Move Postgres SERIAL sequences past the explicit IDs we inserted"""
+        if self.db.engine.dialect.name != 'postgresql':
+            return
+        for table in tables:
+            self.db.session.execute(self.db.text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT COALESCE(MAX(id), 1) FROM {table}))"
+            ))
+
+    def _preserve_updated_at(self):
+        """Keep the schema's updated_at trigger from rewriting generated timestamps in this transaction.
+
+        Comment inserts fire update_comments_count, whose UPDATE issues would otherwise
+        stamp every commented issue with the current time (see services/maintenance.py).
+        """
+        if self.db.engine.dialect.name == 'postgresql':
+            self.db.session.execute(self.db.text("SELECT set_config('sunoaid.preserve_updated_at', 'on', true)"))
+
+    def _random_past(self, max_days=365):
+        # Square the uniform sample so recent days are denser, like a real feed
+        offset = (self.rng.random() ** 2) * max_days * 86400
+        return self.now - timedelta(seconds=offset)
+
+    # --- entities ---
+
+    def generate_categories(self):
+        from models.models import Category
+
+        categories = Category.query.order_by(Category.id).all()
+        if not categories:
+            for name, description, color, icon in DEFAULT_CATEGORIES:
+                self.db.session.add(Category(name=name, description=description, color_code=color, icon_name=icon))
+            self.db.session.flush()
+            categories = Category.query.order_by(Category.id).all()
+
+        self.category_ids = [category.id for category in categories]
+        self.category_names = {category.id: category.name for category in categories}
+
+    def generate_locations(self, provinces=8, cities_per_province=6, districts_per_city=8):
+        """Province -> city -> district hierarchy, each district with a centre point for issue coordinates"""
+        from models.models import Location
+
+        next_id = self._next_id('locations')
+        rows = []
+        for p in range(provinces):
+            province_id = next_id
+            province_name = f'Bench Province {p + 1}'
+            next_id += 1
+            rows.append({'id': province_id, 'name': province_name, 'type': 'province', 'parent_id': None,
+                         'is_active': True, 'city': province_name, 'province': province_name,
+                         'created_at': self.now})
+            # Spread provinces over a rough lat/long box
+            province_lat = 24.0 + self.rng.uniform(0, 12)
+            province_lng = 62.0 + self.rng.uniform(0, 12)
+
+            for c in range(cities_per_province):
+                city_id = next_id
+                city_name = f'Bench City {p + 1}-{c + 1}'
+                next_id += 1
+                rows.append({'id': city_id, 'name': city_name, 'type': 'city', 'parent_id': province_id,
+                             'is_active': True, 'city': city_name, 'province': province_name,
+                             'created_at': self.now})
+                city_lat = province_lat + self.rng.uniform(-1.5, 1.5)
+                city_lng = province_lng + self.rng.uniform(-1.5, 1.5)
+
+                for d in range(districts_per_city):
+                    district_id = next_id
+                    next_id += 1
+                    rows.append({'id': district_id, 'name': f'District {d + 1}, {city_name}', 'type': 'district',
+                                 'parent_id': city_id, 'is_active': True, 'city': city_name,
+                                 'province': province_name, 'created_at': self.now})
+                    self.districts.append((district_id,
+                                           city_lat + self.rng.uniform(-0.08, 0.08),
+                                           city_lng + self.rng.uniform(-0.08, 0.08)))
+
+        self._insert(Location, rows)
+
+    def generate_users(self):
+        from models.models import User
+
+        start_id = self._next_id('users')
+        rows = []
+        for i in range(self.n_users):
+            user_id = start_id + i
+            first = self.rng.choice(FIRST_NAMES)
+            last = self.rng.choice(LAST_NAMES)
+            rows.append({
+                'id': user_id,
+                'name': f'{first} {last}',
+                'email': f'user{user_id}@{BENCH_EMAIL_DOMAIN}',
+                'password': BENCH_PASSWORD,
+                'phone': None,
+                'avatar_url': None,
+                'created_at': self._random_past(730),
+            })
+            self.user_ids.append(user_id)
+            if len(rows) >= BATCH_SIZE:
+                self._insert(User, rows)
+                rows = []
+        self._insert(User, rows)
+
+    def _issue_text(self, category_id):
+        templates = ISSUE_TEMPLATES.get(self.category_names.get(category_id), ISSUE_TEMPLATES['Other'])
+        title_template, fragments = self.rng.choice(templates)
+        street = self.rng.choice(STREETS)
+        picked = self.rng.sample(fragments, k=min(len(fragments), self.rng.randint(2, 3)))
+        description = '. '.join(fragment.capitalize() for fragment in picked) + '.'
+        return title_template.format(street=street), description
+
+    def generate_issues(self):
+        """Issues with their votes and nested comments, generated and inserted batch by batch"""
+        from models.models import Issue, Vote, Comment
+        from services.duplicates import geo_cell_for
+
+        issue_id = self._next_id('issues')
+        vote_id = self._next_id('votes')
+        comment_id = self._next_id('comments')
+        recent = []  # recently generated issues, used to seed near-duplicate reports
+
+        remaining = self.n_issues
+        while remaining > 0:
+            batch = min(BATCH_SIZE, remaining)
+            issue_rows, vote_rows, comment_rows = [], [], []
+
+            for _ in range(batch):
+                if recent and self.rng.random() < 0.05:
+                    # Near-duplicate: same category and place as an earlier report, reworded slightly
+                    source = self.rng.choice(recent)
+                    category_id, location_id = source['category_id'], source['location_id']
+                    lat = source['latitude'] + self.rng.uniform(-0.0005, 0.0005)
+                    lng = source['longitude'] + self.rng.uniform(-0.0005, 0.0005)
+                    title = source['title'] if self.rng.random() < 0.5 else f"{source['title']} again"
+                    description = source['description'] + ' ' + self.rng.choice(COMMENT_FRAGMENTS)
+                else:
+                    category_id = self.rng.choice(self.category_ids)
+                    location_id, center_lat, center_lng = self.rng.choice(self.districts)
+                    lat = center_lat + self.rng.uniform(-0.02, 0.02)
+                    lng = center_lng + self.rng.uniform(-0.02, 0.02)
+                    title, description = self._issue_text(category_id)
+
+                created_at = self._random_past()
+                status = weighted_choice(self.rng, STATUSES)
+                resolved_at = None
+                if status in ('resolved', 'closed'):
+                    resolved_at = min(self.now, created_at + timedelta(hours=self.rng.expovariate(1 / 96)))
+
+                # Votes: distinct users per issue, so the (user_id, issue_id) constraint holds
+                n_votes = min(len(self.user_ids), int(self.rng.expovariate(1 / self.avg_votes)))
+                upvotes = downvotes = 0
+                for voter in self.rng.sample(self.user_ids, n_votes):
+                    vote_type = 'up' if self.rng.random() < 0.8 else 'down'
+                    if vote_type == 'up':
+                        upvotes += 1
+                    else:
+                        downvotes += 1
+                    vote_rows.append({'id': vote_id, 'vote_type': vote_type, 'user_id': voter,
+                                      'issue_id': issue_id,
+                                      'created_at': min(self.now, created_at + timedelta(hours=self.rng.uniform(0, 72)))})
+                    vote_id += 1
+
+                # Comments: roughly a third are replies to an earlier comment on the same issue
+                n_comments = int(self.rng.expovariate(1 / self.avg_comments))
+                issue_comment_ids = []
+                for _ in range(n_comments):
+                    parent_id = None
+                    if issue_comment_ids and self.rng.random() < 0.35:
+                        parent_id = self.rng.choice(issue_comment_ids)
+                    comment_rows.append({'id': comment_id, 'content': self.rng.choice(COMMENT_FRAGMENTS),
+                                         'parent_id': parent_id, 'user_id': self.rng.choice(self.user_ids),
+                                         'issue_id': issue_id,
+                                         'created_at': min(self.now, created_at + timedelta(hours=self.rng.uniform(0, 240)))})
+                    issue_comment_ids.append(comment_id)
+                    comment_id += 1
+
+                row = {
+                    'id': issue_id,
+                    'title': title,
+                    'description': description,
+                    'status': status,
+                    'severity': weighted_choice(self.rng, SEVERITIES),
+                    'address': f'{self.rng.randint(1, 999)} {self.rng.choice(STREETS)}',
+                    'latitude': lat,
+                    'longitude': lng,
+                    'geo_cell': geo_cell_for(lat, lng),
+                    'media_urls': [],
+                    'upvotes': upvotes,
+                    'downvotes': downvotes,
+                    'views': int(self.rng.expovariate(1 / 40)),
+                    'comments_count': 0,  # recomputed after insert, see _recount_comments
+                    'created_at': created_at,
+                    'updated_at': resolved_at or created_at,
+                    'resolved_at': resolved_at,
+                    'user_id': self.rng.choice(self.user_ids),
+                    'category_id': category_id,
+                    'location_id': location_id,
+                }
+                issue_rows.append(row)
+                recent.append(row)
+                if len(recent) > 500:
+                    recent.pop(0)
+                issue_id += 1
+
+            self._preserve_updated_at()
+            self._insert(Issue, issue_rows)
+            self._insert(Vote, vote_rows)
+            self._insert(Comment, comment_rows)
+            self.db.session.commit()
+
+            remaining -= batch
+            print(f"  ... {self.n_issues - remaining:,}/{self.n_issues:,} issues")
+
+    def _recount_comments(self):
+        """Set comments_count from the comments table - works with or without the schema's comment triggers.
+
+        Runs in id-range batches that keep updated_at, like the other issue backfills.
+        """
+        from models.models import Issue, Comment
+        from services.maintenance import update_issues_in_batches
+
+        count = self.db.select(self.db.func.count(Comment.id)).where(
+            Comment.issue_id == Issue.id
+        ).scalar_subquery()
+        update_issues_in_batches({'comments_count': count})
+
+    def run(self):
+        from services.ranking import refresh_all_hot_scores
+        from services.analytics import rebuild_rollups
+
+        started = time.perf_counter()
+        print(f"🌱 Generating dataset: scale={self.n_issues:,} issues, seed={self.seed}")
+
+        self.generate_categories()
+        self.generate_locations()
+        self.generate_users()
+        self.db.session.commit()
+        print(f"  ... {len(self.districts)} districts, {len(self.user_ids):,} users")
+
+        self.generate_issues()
+        self._recount_comments()
+        refresh_all_hot_scores()
+        rebuild_rollups()
+        self._sync_sequences(['locations', 'users', 'issues', 'votes', 'comments'])
+        self.db.session.commit()
+
+        print(f"✅ Dataset generated in {time.perf_counter() - started:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a synthetic SunoAid dataset for benchmarking')
+    parser.add_argument('--scale', type=parse_scale, default=SCALES['10k'],
+                        help='Number of issues: 10k, 100k, 1m or an integer (default: 10k)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+    parser.add_argument('--database-url', help='Database to fill (defaults to DATABASE_URL)')
+    parser.add_argument('--create-tables', action='store_true', help='Run db.create_all() first')
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+
+    from app import app
+    from models.models import db
+
+    with app.app_context():
+        if args.create_tables:
+            db.create_all()
+        DatasetGenerator(db, scale=args.scale, seed=args.seed).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
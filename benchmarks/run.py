@@ -0,0 +1,343 @@
+"""Benchmark runner for the SunoAid API.
+
+Drives every endpoint either in-process through the Flask test client (default,
+also counts SQL queries per request) or against a running server (--base-url),
+and reports p50/p95/p99 latency per endpoint. Results are written as JSON so
+two commits can be compared:
+
+    python -m benchmarks.datagen --scale 10k
+    python -m benchmarks.run --requests 200 --output benchmarks/results/head.json
+    python -m benchmarks.run --baseline benchmarks/results/main.json
+
+With --baseline the runner exits non-zero when an endpoint's p95 grows by more
+than --threshold or it issues more queries per request than before.
+
+Write endpoints (vote, comment, create issue) mutate the database; pass
+--read-only to skip them.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+from benchmarks.datagen import BENCH_EMAIL_DOMAIN, BENCH_PASSWORD
+
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Number of distinct logged-in users the write scenarios rotate through
+SESSION_POOL_SIZE = 20
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- Clients ---
+
+class TestClientSession:
+    """In-process client: Flask test client plus a SQL query counter on the engine"""
+
+    def __init__(self, app, user_id=None):
+        self.client = app.test_client()
+        if user_id:
+            with self.client.session_transaction() as sess:
+                sess['user_id'] = user_id
+
+    def request(self, method, path, payload=None):
+        counter = QueryCounter.instance
+        counter.reset()
+        started = time.perf_counter()
+        response = self.client.open(path, method=method, json=payload)
+        elapsed = time.perf_counter() - started
+        return response.status_code, elapsed, counter.count
+
+
+class QueryCounter:
+    """Counts statements executed on the engine while a benchmark request runs"""
+
+    instance = None
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+
+        self.count = 0
+        event.listen(engine, 'before_cursor_execute', self._on_execute)
+        QueryCounter.instance = self
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+
+class HttpSession:
+    """Client for a running server; latency only, queries are not visible from outside"""
+
+    def __init__(self, base_url, email=None):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+        if email:
+            status, _, _ = self.request('POST', '/api/auth/login', {'email': email, 'password': BENCH_PASSWORD})
+            if status != 200:
+                raise RuntimeError(f'Could not log in as {email} (status {status})')
+
+    def request(self, method, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            status = e.code
+        elapsed = time.perf_counter() - started
+        return status, elapsed, None
+
+
+# --- Scenarios ---
+
+class Scenarios:
+    """Endpoint scenarios; each returns (method, path, payload, needs_auth) for one request"""
+
+    def __init__(self, rng, max_issue_id, category_ids, location_ids):
+        self.rng = rng
+        self.max_issue_id = max_issue_id
+        self.category_ids = category_ids
+        self.location_ids = location_ids
+
+    def _issue_id(self):
+        return self.rng.randint(1, self.max_issue_id)
+
+    def _page(self):
+        # Most traffic hits the first pages of a feed
+        return min(50, int(self.rng.expovariate(1 / 3)) + 1)
+
+    def read_scenarios(self):
+        return {
+            'get_issues:recent': lambda: ('GET', f'/api/issues?sort=recent&page={self._page()}', None, False),
+            'get_issues:hot': lambda: ('GET', f'/api/issues?sort=hot&page={self._page()}', None, False),
+            'get_issues:popular': lambda: ('GET', f'/api/issues?sort=popular&page={self._page()}', None, False),
+            'get_issues:urgent': lambda: ('GET', f'/api/issues?sort=urgent&page={self._page()}', None, False),
+            'get_issues:category': lambda: ('GET', f'/api/issues?category_id={self.rng.choice(self.category_ids)}'
+                                                   f'&status=open&page={self._page()}', None, False),
+            'get_issues:location': lambda: ('GET', f'/api/issues?location_id={self.rng.choice(self.location_ids)}',
+                                            None, False),
+            'get_issues:search': lambda: ('GET', f"/api/issues?search={self.rng.choice(['pothole', 'water', 'light', 'garbage'])}",
+                                          None, False),
+            'get_issue': lambda: ('GET', f'/api/issues/{self._issue_id()}', None, False),
+            'get_comments': lambda: ('GET', f'/api/issues/{self._issue_id()}/comments', None, False),
+            'check_duplicates': lambda: ('POST', '/api/issues/duplicates', {
+                'title': f"Pothole on {self.rng.choice(['Main Street', 'Mall Road', 'Canal Road'])}",
+                'description': 'Large pothole damaging cars near the intersection',
+                'category_id': self.rng.choice(self.category_ids),
+                'location_id': self.rng.choice(self.location_ids),
+                'latitude': 30.0 + self.rng.uniform(-5, 5),
+                'longitude': 70.0 + self.rng.uniform(-5, 5),
+            }, False),
+            'get_categories': lambda: ('GET', '/api/issues/categories', None, False),
+            'get_locations': lambda: ('GET', '/api/locations?type=city', None, False),
+            'get_dashboard_stats': lambda: ('GET', '/api/admin/stats', None, False),
+            'get_trends': lambda: ('GET', f"/api/analytics/trends?days={self.rng.choice([7, 30, 90])}"
+                                          f"&group_by={self.rng.choice(['category', 'location'])}", None, False),
+            'get_resolution_times': lambda: ('GET', f'/api/analytics/resolution-times?days=90'
+                                                    f'&category_id={self.rng.choice(self.category_ids)}', None, False),
+        }
+
+    def auth_read_scenarios(self):
+        return {
+            'get_issues:my_votes': lambda: ('GET', f'/api/issues?sort=recent&my_votes=true&page={self._page()}',
+                                            None, True),
+            'get_my_votes': lambda: ('GET', '/api/issues/my-votes?ids='
+                                            + ','.join(str(self._issue_id()) for _ in range(20)), None, True),
+        }
+
+    def write_scenarios(self):
+        return {
+            'vote_issue': lambda: ('POST', f'/api/issues/{self._issue_id()}/vote',
+                                   {'vote_type': self.rng.choice(['up', 'up', 'up', 'down'])}, True),
+            'add_comment': lambda: ('POST', f'/api/issues/{self._issue_id()}/comments',
+                                    {'content': 'Benchmark comment'}, True),
+            'create_issue': lambda: ('POST', '/api/issues', {
+                'title': 'Benchmark pothole report',
+                'description': 'Generated by the benchmark runner',
+                'category_id': self.rng.choice(self.category_ids),
+                'location_id': self.rng.choice(self.location_ids),
+                'severity': 'medium',
+                'latitude': 30.0 + self.rng.uniform(-5, 5),
+                'longitude': 70.0 + self.rng.uniform(-5, 5),
+            }, True),
+        }
+
+
+def summarize(timings, query_counts, statuses):
+    timings_ms = sorted(t * 1000 for t in timings)
+    queries = [q for q in query_counts if q is not None]
+    return {
+        'requests': len(timings_ms),
+        'errors': sum(1 for status in statuses if status >= 400),
+        'p50_ms': round(percentile(timings_ms, 50), 3),
+        'p95_ms': round(percentile(timings_ms, 95), 3),
+        'p99_ms': round(percentile(timings_ms, 99), 3),
+        'mean_ms': round(sum(timings_ms) / len(timings_ms), 3),
+        'max_ms': round(timings_ms[-1], 3),
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def run_scenario(name, make_request, anonymous, sessions, n_requests, warmup, rng):
+    timings, query_counts, statuses = [], [], []
+    for i in range(warmup + n_requests):
+        method, path, payload, needs_auth = make_request()
+        session = rng.choice(sessions) if needs_auth else anonymous
+        status, elapsed, queries = session.request(method, path, payload)
+        if i >= warmup:
+            timings.append(elapsed)
+            query_counts.append(queries)
+            statuses.append(status)
+    result = summarize(timings, query_counts, statuses)
+    print(f"  {name:<24} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+          f"p99 {result['p99_ms']:>8.2f}ms  queries {result['queries_per_request']}  "
+          f"errors {result['errors']}")
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Print deltas against a previous results file; returns the list of regressed endpoints"""
+    regressions = []
+    print(f"\n📊 Compared with {baseline.get('commit') or 'baseline'}:")
+    for name, current in results['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        ratio = current['p95_ms'] / previous['p95_ms'] if previous['p95_ms'] else 1.0
+        more_queries = (current['queries_per_request'] is not None
+                        and previous.get('queries_per_request') is not None
+                        and current['queries_per_request'] > previous['queries_per_request'])
+        regressed = ratio > threshold or more_queries
+        marker = '❌' if regressed else '  '
+        print(f"{marker} {name:<24} p95 {previous['p95_ms']:.2f} -> {current['p95_ms']:.2f}ms ({ratio:.2f}x)  "
+              f"queries {previous.get('queries_per_request')} -> {current['queries_per_request']}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the SunoAid API endpoints')
+    parser.add_argument('--base-url', help='Benchmark a running server instead of the in-process test client')
+    parser.add_argument('--database-url', help='Database for the in-process app (defaults to DATABASE_URL)')
+    parser.add_argument('--requests', type=int, default=100, help='Measured requests per endpoint (default: 100)')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per endpoint (default: 10)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for request parameters (default: 42)')
+    parser.add_argument('--only', action='append', help='Only run endpoints whose name starts with this (repeatable)')
+    parser.add_argument('--read-only', action='store_true', help='Skip endpoints that write to the database')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/<commit>-<timestamp>.json)')
+    parser.add_argument('--baseline', help='Previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='Allowed p95 growth factor before --baseline fails (default: 1.2)')
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+
+    from app import app
+    from models.models import db, Issue, Category, Location, User
+
+    rng = random.Random(args.seed)
+
+    with app.app_context():
+        max_issue_id = db.session.query(db.func.max(Issue.id)).scalar() or 1
+        total_issues = db.session.query(db.func.count(Issue.id)).scalar()
+        category_ids = [row[0] for row in db.session.query(Category.id).all()] or [1]
+        location_ids = [row[0] for row in db.session.query(Location.id).filter(Location.type == 'district').all()]
+        location_ids = location_ids or [row[0] for row in db.session.query(Location.id).all()] or [1]
+        bench_users = [row[0] for row in db.session.query(User.id)
+                       .filter(User.email.like(f'%@{BENCH_EMAIL_DOMAIN}'))
+                       .order_by(User.id).limit(SESSION_POOL_SIZE).all()]
+        if not bench_users:
+            bench_users = [row[0] for row in db.session.query(User.id).order_by(User.id).limit(SESSION_POOL_SIZE).all()]
+
+        if args.base_url:
+            anonymous = HttpSession(args.base_url)
+            sessions = [HttpSession(args.base_url, email=f'user{user_id}@{BENCH_EMAIL_DOMAIN}')
+                        for user_id in bench_users]
+        else:
+            QueryCounter(db.engine)
+            anonymous = TestClientSession(app)
+            sessions = [TestClientSession(app, user_id=user_id) for user_id in bench_users]
+
+    scenarios = Scenarios(rng, max_issue_id, category_ids, location_ids)
+    selected = scenarios.read_scenarios()
+    if not sessions:
+        print("⚠️  WARNING: No users found, skipping authenticated endpoints")
+    else:
+        selected.update(scenarios.auth_read_scenarios())
+        if not args.read_only:
+            selected.update(scenarios.write_scenarios())
+    if args.only:
+        selected = {name: fn for name, fn in selected.items() if any(name.startswith(p) for p in args.only)}
+
+    target = args.base_url or 'flask test client'
+    print(f"🚀 Benchmarking {len(selected)} endpoints against {target} ({total_issues:,} issues)")
+
+    endpoints = {}
+    for name, make_request in selected.items():
+        endpoints[name] = run_scenario(name, make_request, anonymous, sessions,
+                                       args.requests, args.warmup, rng)
+
+    results = {
+        'commit': git_commit(),
+        'timestamp': datetime.utcnow().isoformat(),
+        'target': target,
+        'dataset': {'issues': total_issues},
+        'config': {'requests': args.requests, 'warmup': args.warmup, 'seed': args.seed,
+                   'read_only': args.read_only},
+        'endpoints': endpoints,
+    }
+
+    output = args.output
+    if not output:
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+        output = os.path.join(DEFAULT_OUTPUT_DIR, f"{results['commit'] or 'local'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"❌ {len(regressions)} endpoint(s) regressed: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,9 @@
 -- VERSION 2.0: Updated 'locations' table to support hierarchical data.
 
 -- Drop tables if they exist (in reverse order of dependencies)
+DROP TABLE IF EXISTS jobs CASCADE;
+DROP TABLE IF EXISTS issue_daily_counts CASCADE;
+DROP TABLE IF EXISTS resolution_time_histogram CASCADE;
 DROP TABLE IF EXISTS votes CASCADE;
 DROP TABLE IF EXISTS comments CASCADE;
 DROP TABLE IF EXISTS issues CASCADE;
@@ -61,11 +64,13 @@ CREATE TABLE issues (
     address TEXT,
     latitude FLOAT,
     longitude FLOAT,
+    geo_cell BIGINT, -- grid cell of (latitude, longitude) for duplicate detection, see services/duplicates.py
     media_urls JSONB DEFAULT '[]'::jsonb,
     upvotes INTEGER DEFAULT 0,
     downvotes INTEGER DEFAULT 0,
     views INTEGER DEFAULT 0,
     comments_count INTEGER DEFAULT 0,
+    hot_score DOUBLE PRECISION NOT NULL DEFAULT 0, -- precomputed feed ranking, see services/ranking.py
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     resolved_at TIMESTAMP WITH TIME ZONE NULL,
@@ -94,6 +99,43 @@ CREATE TABLE comments (
     issue_id INTEGER NOT NULL REFERENCES issues(id) ON DELETE CASCADE
 );
 
+-- Create Jobs table (background work queue, see services/jobs.py)
+CREATE TABLE jobs (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    key VARCHAR(100), -- groups jobs handled together, e.g. 'user:5' for a notification digest
+    payload JSONB DEFAULT '{}'::jsonb,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'running', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at TIMESTAMP WITH TIME ZONE,
+    locked_by VARCHAR(100),
+    last_error TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Analytics rollups, maintained by the API and rebuilt with 'flask rebuild-analytics'
+-- (category_id / location_id are 0 when the issue has none)
+CREATE TABLE issue_daily_counts (
+    day DATE NOT NULL,
+    category_id INTEGER NOT NULL DEFAULT 0,
+    location_id INTEGER NOT NULL DEFAULT 0,
+    created_count INTEGER NOT NULL DEFAULT 0,
+    resolved_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, category_id, location_id)
+);
+
+CREATE TABLE resolution_time_histogram (
+    day DATE NOT NULL, -- day the issue was resolved
+    category_id INTEGER NOT NULL DEFAULT 0,
+    location_id INTEGER NOT NULL DEFAULT 0,
+    bucket SMALLINT NOT NULL, -- log-scaled time-to-resolve bucket, see services/analytics.py
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, category_id, location_id, bucket)
+);
+
 -- Create indexes for better performance
 CREATE INDEX idx_issues_user_id ON issues(user_id);
 CREATE INDEX idx_issues_category_id ON issues(category_id);
@@ -101,12 +143,16 @@ CREATE INDEX idx_issues_location_id ON issues(location_id);
 CREATE INDEX idx_issues_status ON issues(status);
 CREATE INDEX idx_issues_severity ON issues(severity);
 CREATE INDEX idx_issues_created_at ON issues(created_at);
+CREATE INDEX idx_issues_hot_score ON issues(hot_score DESC, id DESC); -- serves sort=hot
+CREATE INDEX idx_issues_category_geo_cell ON issues(category_id, geo_cell); -- duplicate detection
 CREATE INDEX idx_locations_parent_id ON locations(parent_id); -- NEW INDEX
 CREATE INDEX idx_votes_user_id ON votes(user_id);
 CREATE INDEX idx_votes_issue_id ON votes(issue_id);
 CREATE INDEX idx_comments_user_id ON comments(user_id);
 CREATE INDEX idx_comments_issue_id ON comments(issue_id);
 CREATE INDEX idx_comments_parent_id ON comments(parent_id);
+CREATE INDEX idx_jobs_status_run_at ON jobs(status, run_at);
+CREATE INDEX idx_jobs_kind_key_status ON jobs(kind, key, status);
 
 -- Insert sample data
 INSERT INTO users (name, email, password) VALUES 
@@ -151,9 +197,13 @@ INSERT INTO issues (title, description, user_id, category_id, location_id, sever
 
 
 -- Function to automatically update updated_at timestamp
+-- (skipped while backfills set sunoaid.preserve_updated_at, see services/maintenance.py)
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
 BEGIN
+    IF current_setting('sunoaid.preserve_updated_at', true) = 'on' THEN
+        RETURN NEW;
+    END IF;
     NEW.updated_at = CURRENT_TIMESTAMP;
     RETURN NEW;
 END;
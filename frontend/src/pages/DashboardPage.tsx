@@ -16,6 +16,7 @@ interface Issue {
   downvotes: number;
   comments_count: number;
   views: number;
+  my_vote?: 'up' | 'down' | null;
   user: {
     id: number;
     name: string;
@@ -72,9 +73,13 @@ const DashboardPage: React.FC = () => {
       if (searchQuery) params.append('search', searchQuery);
       if (selectedCategory) params.append('category_id', selectedCategory);
       if (selectedStatus) params.append('status', selectedStatus);
+      params.append('my_votes', 'true');
       
       // Handle sorting
       switch (sortBy) {
+        case 'hot':
+          params.append('sort', 'hot');
+          break;
         case 'popular':
           params.append('sort', 'popular');
           break;
@@ -96,8 +101,9 @@ const DashboardPage: React.FC = () => {
 
   const handleVote = async (issueId: number, voteType: 'up' | 'down') => {
     try {
-      await axios.post(`/issues/${issueId}/vote`, { vote_type: voteType });
-      fetchIssues();
+      const response = await axios.post(`/issues/${issueId}/vote`, { vote_type: voteType });
+      const { upvotes, downvotes, my_vote } = response.data;
+      setIssues(prev => prev.map(issue => issue.id === issueId ? { ...issue, upvotes, downvotes, my_vote } : issue));
     } catch (error) {
       console.error('Failed to vote:', error);
     }
@@ -213,6 +219,7 @@ const DashboardPage: React.FC = () => {
               onChange={(e) => setSortBy(e.target.value)}
             >
               <option value="recent">Most Recent</option>
+              <option value="hot">Trending</option>
               <option value="popular">Most Popular</option>
               <option value="urgent">Most Urgent</option>
             </select>
@@ -325,14 +332,14 @@ const DashboardPage: React.FC = () => {
                   <div className="flex items-center space-x-6">
                     <button
                       onClick={() => handleVote(issue.id, 'up')}
-                      className="flex items-center space-x-2 text-gray-500 hover:text-green-600 transition-colors duration-200"
+                      className={`flex items-center space-x-2 ${issue.my_vote === 'up' ? 'text-green-600' : 'text-gray-500'} hover:text-green-600 transition-colors duration-200`}
                     >
                       <ThumbsUp className="w-5 h-5" />
                       <span className="text-sm font-medium">{issue.upvotes}</span>
                     </button>
                     <button
                       onClick={() => handleVote(issue.id, 'down')}
-                      className="flex items-center space-x-2 text-gray-500 hover:text-red-600 transition-colors duration-200"
+                      className={`flex items-center space-x-2 ${issue.my_vote === 'down' ? 'text-red-600' : 'text-gray-500'} hover:text-red-600 transition-colors duration-200`}
                     >
                       <ThumbsDown className="w-5 h-5" />
                       <span className="text-sm font-medium">{issue.downvotes}</span>
@@ -69,6 +69,44 @@ const IssueDetailPage: React.FC = () => {
     }
   }, [id]);
 
+  // Live vote, comment and status deltas instead of re-fetching the issue
+  useEffect(() => {
+    if (!id) return;
+    const source = new EventSource(`${axios.defaults.baseURL}/events/issues/${id}`, { withCredentials: true });
+
+    source.addEventListener('vote', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      setIssue(prev => prev ? { ...prev, upvotes: data.upvotes, downvotes: data.downvotes } : prev);
+    });
+    source.addEventListener('comment', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      setIssue(prev => prev ? { ...prev, comments_count: data.comments_count } : prev);
+      if (data.comment.parent_id) return;
+      // Events carry a preview only; fetch the list when the content was cut short
+      if (data.comment.content_truncated) {
+        fetchComments();
+      } else {
+        addComment({
+          id: data.comment.id,
+          content: data.comment.content,
+          created_at: data.comment.created_at,
+          user: { id: data.comment.user_id, name: data.comment.user_name },
+          replies_count: 0
+        });
+      }
+    });
+    source.addEventListener('status', (e) => {
+      const data = JSON.parse((e as MessageEvent).data);
+      setIssue(prev => prev ? { ...prev, status: data.status, resolved_at: data.resolved_at } : prev);
+    });
+
+    return () => source.close();
+  }, [id]);
+
+  const addComment = (comment: Comment) => {
+    setComments(prev => prev.some(c => c.id === comment.id) ? prev : [comment, ...prev]);
+  };
+
   const fetchIssue = async () => {
     try {
       const response = await axios.get(`issues/${id}`);
@@ -94,8 +132,8 @@ const IssueDetailPage: React.FC = () => {
     if (!user) return;
     
     try {
-      await axios.post(`issues/${id}/vote`, { vote_type: voteType });
-      fetchIssue();
+      const response = await axios.post(`issues/${id}/vote`, { vote_type: voteType });
+      setIssue(prev => prev ? { ...prev, upvotes: response.data.upvotes, downvotes: response.data.downvotes } : prev);
     } catch (error) {
       console.error('Failed to vote:', error);
     }
@@ -107,9 +145,9 @@ const IssueDetailPage: React.FC = () => {
 
     setCommentLoading(true);
     try {
-      await axios.post(`issues/${id}/comments`, { content: newComment });
+      const response = await axios.post(`issues/${id}/comments`, { content: newComment });
       setNewComment('');
-      fetchComments();
+      addComment(response.data.comment);
     } catch (error) {
       console.error('Failed to post comment:', error);
     } finally {
@@ -95,11 +95,13 @@ class Issue(db.Model):
     address = db.Column(db.Text)
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
+    geo_cell = db.Column(db.BigInteger, nullable=True)  # grid cell of (latitude, longitude), see services/duplicates.py
     media_urls = db.Column(db.JSON, default=list)
     upvotes = db.Column(db.Integer, default=0)
     downvotes = db.Column(db.Integer, default=0)
     views = db.Column(db.Integer, default=0)
     comments_count = db.Column(db.Integer, default=0)
+    hot_score = db.Column(db.Float, default=0, nullable=False)  # see services/ranking.py
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     resolved_at = db.Column(db.DateTime, nullable=True)
@@ -113,6 +115,12 @@ class Issue(db.Model):
     user = db.relationship('User', backref='issues')
     category = db.relationship('Category', backref='issues')
     location = db.relationship('Location', backref='issues')
+    
+    # Spatial neighbourhood lookup for duplicate detection
+    __table_args__ = (
+        db.Index('idx_issues_category_geo_cell', 'category_id', 'geo_cell'),
+        db.Index('idx_issues_hot_score', hot_score.desc(), id.desc()),  # serves sort=hot
+    )
 
     def to_dict(self):
         return {
@@ -129,6 +137,7 @@ class Issue(db.Model):
             'downvotes': self.downvotes,
             'views': self.views,
             'comments_count': self.comments_count,
+            'hot_score': self.hot_score,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None,
@@ -191,3 +200,60 @@ class Comment(db.Model):
             'user': self.user.to_dict() if self.user else None,
             'replies_count': len(self.replies) if self.replies else 0
         }
+
+# --- Job Model (background work, see services/jobs.py) ---
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # handler name, e.g. 'notify'
+    key = db.Column(db.String(100), nullable=True)  # groups jobs handled together, e.g. 'user:5' for a digest
+    payload = db.Column(db.JSON, default=dict)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    locked_by = db.Column(db.String(100), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    __table_args__ = (
+        db.Index('idx_jobs_status_run_at', 'status', 'run_at'),
+        db.Index('idx_jobs_kind_key_status', 'kind', 'key', 'status'),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'key': self.key,
+            'payload': self.payload or {},
+            'status': self.status,
+            'attempts': self.attempts,
+            'run_at': self.run_at.isoformat() if self.run_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+# --- Analytics rollups (see services/analytics.py) ---
+# category_id / location_id use 0 for "none" so they can be part of the primary key
+class IssueDailyCount(db.Model):
+    __tablename__ = 'issue_daily_counts'
+    
+    day = db.Column(db.Date, primary_key=True)
+    category_id = db.Column(db.Integer, primary_key=True, default=0)
+    location_id = db.Column(db.Integer, primary_key=True, default=0)
+    created_count = db.Column(db.Integer, nullable=False, default=0)
+    resolved_count = db.Column(db.Integer, nullable=False, default=0)
+
+class ResolutionHistogram(db.Model):
+    __tablename__ = 'resolution_time_histogram'
+    
+    day = db.Column(db.Date, primary_key=True)  # day the issue was resolved
+    category_id = db.Column(db.Integer, primary_key=True, default=0)
+    location_id = db.Column(db.Integer, primary_key=True, default=0)
+    bucket = db.Column(db.SmallInteger, primary_key=True)  # log-scaled time-to-resolve bucket
+    count = db.Column(db.Integer, nullable=False, default=0)
@@ -1,11 +1,33 @@
 from flask import Blueprint
-from flask import jsonify
+from flask import jsonify, request, session, current_app
 from sqlalchemy import func, case
 from datetime import datetime, timedelta
 from models.models import db, Issue, User, Category
+from services.moderation import (
+    BulkModerationError, VALID_STATUSES, VALID_SEVERITIES, MAX_BULK_ISSUES, FILTER_FIELDS, SET_FIELDS,
+    bulk_update_issues, row_to_dict
+)
+import logging
 
 
 admin_api_bp = Blueprint('admin_api', __name__)
+logger = logging.getLogger(__name__)
+
+def get_admin_user():
+    """The logged-in user if their email is in ADMIN_EMAILS, else None"""
+    user_id = session.get('user_id')
+    if not user_id:
+        return None
+    user = User.query.get(user_id)
+    if user and user.email in current_app.config.get('ADMIN_EMAILS', ()):
+        return user
+    return None
+
+def parse_datetime(value, field):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise BulkModerationError(f'{field} must be an ISO date/time')
 
 @admin_api_bp.route('/stats', methods=['GET'])
 def get_dashboard_stats():
@@ -52,5 +74,91 @@ def get_dashboard_stats():
         return jsonify(stats), 200
 
     except Exception as e:
-        print(f"Error in get_dashboard_stats: {e}")
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        logger.exception("Error in get_dashboard_stats")
+        return jsonify({'error': str(e)}), 500
+
+@admin_api_bp.route('/issues/bulk', methods=['POST'])
+def bulk_moderate_issues():
+    """Set status / category / severity on many issues at once.
+
+    Body: {"issue_ids": [...]} and/or {"filters": {...}}, plus {"set": {"status": ..., "category_id": ..., "severity": ...}}
+    """
+    admin = get_admin_user()
+    if not admin:
+        return jsonify({'error': 'Admin access required'}), 403
+
+    try:
+        data = request.get_json() or {}
+        changes = data.get('set') or {}
+        filters = data.get('filters') or {}
+        if not isinstance(changes, dict) or not isinstance(filters, dict):
+            return jsonify({'error': 'set and filters must be objects'}), 400
+        filters = dict(filters)
+
+        unknown = sorted(set(filters) - set(FILTER_FIELDS))
+        if unknown:
+            return jsonify({'error': f"Unknown filter(s): {', '.join(unknown)}"}), 400
+        unknown = sorted(set(changes) - set(SET_FIELDS))
+        if unknown:
+            return jsonify({'error': f"Unknown field(s) in set: {', '.join(unknown)}"}), 400
+
+        status = changes.get('status')
+        severity = changes.get('severity')
+        category_id = changes.get('category_id')
+
+        if status is not None and status not in VALID_STATUSES:
+            return jsonify({'error': f'Invalid status: {status}'}), 400
+        if severity is not None and severity not in VALID_SEVERITIES:
+            return jsonify({'error': f'Invalid severity: {severity}'}), 400
+        if category_id is not None:
+            try:
+                category_id = int(category_id)
+            except (TypeError, ValueError):
+                return jsonify({'error': 'category_id must be an integer'}), 400
+            if not Category.query.get(category_id):
+                return jsonify({'error': f'Category not found: {category_id}'}), 400
+
+        raw_ids = data.get('issue_ids') or []
+        if not isinstance(raw_ids, list):
+            return jsonify({'error': 'issue_ids must be a list of integers'}), 400
+        try:
+            issue_ids = sorted({int(value) for value in raw_ids})
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Issue IDs must be integers'}), 400
+        if len(issue_ids) > MAX_BULK_ISSUES:
+            return jsonify({'error': f'At most {MAX_BULK_ISSUES} issue IDs per request'}), 400
+
+        if filters.get('status') and filters['status'] not in VALID_STATUSES:
+            return jsonify({'error': f"Invalid status filter: {filters['status']}"}), 400
+        if filters.get('severity') and filters['severity'] not in VALID_SEVERITIES:
+            return jsonify({'error': f"Invalid severity filter: {filters['severity']}"}), 400
+        for field in ('category_id', 'location_id'):
+            if filters.get(field):
+                try:
+                    filters[field] = int(filters[field])
+                except (TypeError, ValueError):
+                    return jsonify({'error': f'{field} filter must be an integer'}), 400
+
+        for field in ('created_after', 'created_before'):
+            if filters.get(field):
+                filters[field] = parse_datetime(filters[field], field)
+
+        rows = bulk_update_issues(
+            issue_ids=issue_ids, filters=filters,
+            status=status, category_id=category_id, severity=severity
+        )
+        logger.info("Bulk moderation applied", extra={'admin_id': admin.id, 'updated': len(rows),
+                                                       'set': changes})
+
+        return jsonify({
+            'message': f'Updated {len(rows)} issues',
+            'updated': len(rows),
+            'issues': [row_to_dict(row) for row in rows]
+        }), 200
+
+    except BulkModerationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Error in bulk_moderate_issues")
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,65 @@
+from flask import Blueprint, request, jsonify
+from services.analytics import trend_series, resolution_percentiles
+
+analytics_api_bp = Blueprint('analytics_api', __name__)
+
+MAX_DAYS = 730
+DEFAULT_PERCENTILES = [50, 90, 95]
+
+def get_days(default):
+    days = request.args.get('days', default, type=int)
+    return max(1, min(days, MAX_DAYS))
+
+@analytics_api_bp.route('/trends', methods=['GET'])
+def get_trends():
+    """Daily created/resolved counts, answered from issue_daily_counts"""
+    try:
+        days = get_days(30)
+        category_id = request.args.get('category_id', type=int)
+        location_id = request.args.get('location_id', type=int)
+        group_by = request.args.get('group_by')
+
+        if group_by not in (None, 'category', 'location'):
+            return jsonify({'error': 'group_by must be category or location'}), 400
+
+        since, series = trend_series(days, category_id=category_id, location_id=location_id, group_by=group_by)
+
+        return jsonify({
+            'since': since.isoformat(),
+            'days': days,
+            'group_by': group_by,
+            'series': [{'key': key, 'points': points} for key, points in series.items()]
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@analytics_api_bp.route('/resolution-times', methods=['GET'])
+def get_resolution_times():
+    """Time-to-resolve percentiles in hours, answered from resolution_time_histogram"""
+    try:
+        days = get_days(90)
+        category_id = request.args.get('category_id', type=int)
+        location_id = request.args.get('location_id', type=int)
+
+        raw_percentiles = request.args.get('percentiles')
+        try:
+            percentiles = [float(p) for p in raw_percentiles.split(',')] if raw_percentiles else DEFAULT_PERCENTILES
+        except ValueError:
+            return jsonify({'error': 'percentiles must be a comma-separated list of numbers'}), 400
+        if any(p <= 0 or p > 100 for p in percentiles):
+            return jsonify({'error': 'percentiles must be between 0 and 100'}), 400
+
+        since, resolved, result = resolution_percentiles(
+            days, percentiles, category_id=category_id, location_id=location_id
+        )
+
+        return jsonify({
+            'since': since.isoformat(),
+            'days': days,
+            'resolved_issues': resolved,
+            'percentiles_hours': result
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
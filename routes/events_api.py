@@ -0,0 +1,44 @@
+from flask import Blueprint, Response
+import queue
+from services.events import broker, issue_channel, FEED_CHANNEL
+
+events_api_bp = Blueprint('events_api', __name__)
+
+# Seconds between keep-alive comments, so proxies don't drop idle streams
+HEARTBEAT_INTERVAL = 15
+
+def event_stream(channel):
+    subscriber = broker.subscribe(channel)
+
+    def generate():
+        try:
+            # Tell the browser how long to wait before reconnecting
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    message = subscriber.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if message is None:
+                    # Dropped for being too slow; the client reconnects
+                    break
+                event, payload = message
+                yield f'event: {event}\ndata: {payload}\n\n'
+        finally:
+            broker.unsubscribe(channel, subscriber)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # disable proxy buffering (nginx)
+    })
+
+@events_api_bp.route('/issues/<int:issue_id>', methods=['GET'])
+def issue_events(issue_id):
+    """Live vote, comment and status deltas for one issue"""
+    return event_stream(issue_channel(issue_id))
+
+@events_api_bp.route('/feed', methods=['GET'])
+def feed_events():
+    """Live deltas for every issue (new issues, votes, comments, status changes)"""
+    return event_stream(FEED_CHANNEL)
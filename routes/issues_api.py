@@ -1,8 +1,18 @@
 from flask import Blueprint, request, jsonify, session
 from models.models import Issue, Category, Location, User, Vote, Comment, db
+from services.ranking import refresh_hot_score
+from services.events import publish_vote, publish_comment, publish_issue_created
+from services.duplicates import find_duplicates, geo_cell_for
+from services.analytics import record_issue_created
+from services.notifications import notify_comment
 from datetime import datetime
+import logging
 
 issues_api_bp = Blueprint('issues_api', __name__)
+logger = logging.getLogger(__name__)
+
+# Upper bound on issue IDs accepted by the batch vote lookup
+MAX_VOTE_LOOKUP_IDS = 100
 
 def get_current_user():
     user_id = session.get('user_id')
@@ -10,6 +20,33 @@ def get_current_user():
         return User.query.get(user_id)
     return None
 
+def parse_coordinates(data):
+    """(latitude, longitude) from a request body as floats, or None for missing values; ValueError if invalid"""
+    coordinates = []
+    for field, bound in (('latitude', 90), ('longitude', 180)):
+        value = data.get(field)
+        if value is None or value == '':
+            coordinates.append(None)
+            continue
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{field} must be a number')
+        if not -bound <= value <= bound:
+            raise ValueError(f'{field} must be between -{bound} and {bound}')
+        coordinates.append(value)
+    return tuple(coordinates)
+
+def get_user_votes(user_id, issue_ids):
+    """Map issue_id -> 'up'/'down' for a user's votes, in one query over the votes(user_id, issue_id) index"""
+    if not issue_ids:
+        return {}
+    rows = db.session.query(Vote.issue_id, Vote.vote_type).filter(
+        Vote.user_id == user_id,
+        Vote.issue_id.in_(issue_ids)
+    ).all()
+    return {issue_id: vote_type for issue_id, vote_type in rows}
+
 @issues_api_bp.route('/', methods=['GET'])
 @issues_api_bp.route('', methods=['GET'])
 def get_issues():
@@ -21,6 +58,7 @@ def get_issues():
         status = request.args.get('status')
         search = request.args.get('search')
         sort = request.args.get('sort', 'recent')
+        include_my_votes = request.args.get('my_votes', '').lower() in ('1', 'true')
         
         query = Issue.query
         
@@ -35,7 +73,10 @@ def get_issues():
             query = query.filter(Issue.title.contains(search) | Issue.description.contains(search))
         
         # Apply sorting
-        if sort == 'popular':
+        if sort == 'hot':
+            # Precomputed score, served by idx_issues_hot_score
+            query = query.order_by(Issue.hot_score.desc(), Issue.id.desc())
+        elif sort == 'popular':
             query = query.order_by((Issue.upvotes - Issue.downvotes).desc(), Issue.created_at.desc())
         elif sort == 'urgent':
             # Order by severity priority: critical > high > medium > low, then by creation date
@@ -56,8 +97,17 @@ def get_issues():
         pagination = query.paginate(page=page, per_page=per_page)
         issues = pagination.items
         
+        issues_data = [issue.to_dict() for issue in issues]
+        
+        # Viewer's own vote per issue, so list views don't need a lookup per card
+        if include_my_votes:
+            user_id = session.get('user_id')
+            my_votes = get_user_votes(user_id, [issue.id for issue in issues]) if user_id else {}
+            for issue_data in issues_data:
+                issue_data['my_vote'] = my_votes.get(issue_data['id'])
+        
         return jsonify({
-            'issues': [issue.to_dict() for issue in issues],
+            'issues': issues_data,
             'pagination': {
                 'page': page,
                 'per_page': per_page,
@@ -87,6 +137,27 @@ def create_issue():
             if not data.get(field):
                 return jsonify({'error': f'Missing required field: {field}'}), 400
         
+        try:
+            latitude, longitude = parse_coordinates(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Look for open reports of the same problem nearby before adding this one;
+        # this is advisory only, so a failure here must not block the report
+        try:
+            possible_duplicates = find_duplicates(
+                title=data['title'],
+                description=data['description'],
+                category_id=data['category_id'],
+                latitude=latitude,
+                longitude=longitude,
+                location_id=data['location_id']
+            )
+        except Exception:
+            logger.exception("Duplicate lookup failed; creating issue anyway")
+            db.session.rollback()
+            possible_duplicates = []
+        
         # Create new issue
         issue = Issue(
             title=data['title'],
@@ -96,22 +167,56 @@ def create_issue():
             location_id=data['location_id'],
             severity=data.get('severity', 'medium'),
             address=data.get('address'),
-            latitude=data.get('latitude'),
-            longitude=data.get('longitude'),
+            latitude=latitude,
+            longitude=longitude,
+            geo_cell=geo_cell_for(latitude, longitude),
             media_urls=data.get('media_urls', [])
         )
         
         db.session.add(issue)
+        db.session.flush()
+        refresh_hot_score(issue.id)
+        record_issue_created(issue)
         db.session.commit()
+        publish_issue_created(issue)
         
         return jsonify({
             'message': 'Issue created successfully',
-            'issue': issue.to_dict()
+            'issue': issue.to_dict(),
+            'possible_duplicates': possible_duplicates
         }), 201
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@issues_api_bp.route('/duplicates', methods=['POST'])
+def check_duplicates():
+    """Open issues that look like the report being written, so the form can warn before submitting"""
+    try:
+        data = request.get_json() or {}
+        
+        if not data.get('title') or not data.get('category_id'):
+            return jsonify({'error': 'title and category_id are required'}), 400
+        
+        try:
+            latitude, longitude = parse_coordinates(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        candidates = find_duplicates(
+            title=data['title'],
+            description=data.get('description', ''),
+            category_id=data['category_id'],
+            latitude=latitude,
+            longitude=longitude,
+            location_id=data.get('location_id')
+        )
+        
+        return jsonify({'duplicates': candidates}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @issues_api_bp.route('/<int:issue_id>', methods=['GET'])
 def get_issue(issue_id):
     try:
@@ -149,6 +254,7 @@ def vote_issue(issue_id):
             if existing_vote.vote_type == vote_type:
                 # Remove vote if same type
                 db.session.delete(existing_vote)
+                my_vote = None
                 if vote_type == 'up':
                     issue.upvotes -= 1
                 else:
@@ -156,6 +262,7 @@ def vote_issue(issue_id):
             else:
                 # Change vote type
                 existing_vote.vote_type = vote_type
+                my_vote = vote_type
                 if vote_type == 'up':
                     issue.upvotes += 1
                     issue.downvotes -= 1
@@ -166,17 +273,51 @@ def vote_issue(issue_id):
             # Create new vote
             vote = Vote(user_id=user.id, issue_id=issue_id, vote_type=vote_type)
             db.session.add(vote)
+            my_vote = vote_type
             if vote_type == 'up':
                 issue.upvotes += 1
             else:
                 issue.downvotes += 1
         
+        refresh_hot_score(issue_id)
         db.session.commit()
+        publish_vote(issue)
         
         return jsonify({
             'message': 'Vote recorded successfully',
             'upvotes': issue.upvotes,
-            'downvotes': issue.downvotes
+            'downvotes': issue.downvotes,
+            'my_vote': my_vote
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@issues_api_bp.route('/my-votes', methods=['GET', 'POST'])
+def get_my_votes():
+    """Current user's votes for a batch of issues: ?ids=1,2,3 or JSON {"issue_ids": [1, 2, 3]}"""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'Authentication required'}), 401
+    
+    try:
+        if request.method == 'POST':
+            raw_ids = (request.get_json() or {}).get('issue_ids', [])
+        else:
+            raw_ids = [value for value in request.args.get('ids', '').split(',') if value.strip()]
+        
+        try:
+            issue_ids = {int(value) for value in raw_ids}
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Issue IDs must be integers'}), 400
+        
+        if len(issue_ids) > MAX_VOTE_LOOKUP_IDS:
+            return jsonify({'error': f'At most {MAX_VOTE_LOOKUP_IDS} issue IDs per request'}), 400
+        
+        votes = get_user_votes(user.id, list(issue_ids))
+        
+        return jsonify({
+            'votes': {str(issue_id): votes.get(issue_id) for issue_id in sorted(issue_ids)}
         }), 200
         
     except Exception as e:
@@ -218,7 +359,10 @@ def add_comment(issue_id):
         )
         
         db.session.add(comment)
+        refresh_hot_score(issue_id)
+        notify_comment(issue, comment, user)
         db.session.commit()
+        publish_comment(issue, comment)
         
         return jsonify({
             'message': 'Comment added successfully',
@@ -0,0 +1,243 @@
+import math
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from models.models import db, Issue, Location, IssueDailyCount, ResolutionHistogram
+
+# Daily rollups behind /api/analytics.
+#
+# issue_daily_counts holds issues created / resolved per (day, category, location).
+# resolution_time_histogram holds, per (resolved day, category, location), how many
+# issues took how long to resolve, in log-scaled buckets: bucket b covers
+# [BASE_HOURS * 2^(b/4), BASE_HOURS * 2^((b+1)/4)) hours, so each bucket is ~19% wide
+# and a percentile read from it is within ~9% of the exact value.
+#
+# Write paths update the rollups in their own transaction: record_issue_created()
+# for new issues, apply_issue_changes() for category / resolution changes;
+# rebuild_rollups() recomputes everything from the issues table in bulk.
+
+BASE_HOURS = 0.25
+BUCKETS_PER_DOUBLING = 4
+NUM_BUCKETS = 72  # up to ~ 0.25h * 2^18 = 7.5 years
+
+
+def resolution_bucket(hours):
+    if hours is None or hours <= BASE_HOURS:
+        return 0
+    bucket = int(math.floor(BUCKETS_PER_DOUBLING * math.log2(hours / BASE_HOURS)))
+    return min(bucket, NUM_BUCKETS - 1)
+
+
+def bucket_midpoint_hours(bucket):
+    """Geometric midpoint of a bucket, used as its representative value"""
+    return BASE_HOURS * 2 ** ((bucket + 0.5) / BUCKETS_PER_DOUBLING)
+
+
+def _keys(issue):
+    return issue.category_id or 0, issue.location_id or 0
+
+
+def _upsert(model, keys, increments):
+    """INSERT ... ON CONFLICT DO UPDATE adding `increments` to the existing row"""
+    stmt = insert(model.__table__).values(**keys, **increments)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={column: model.__table__.c[column] + stmt.excluded[column] for column in increments}
+    )
+    db.session.execute(stmt)
+
+
+# --- Incremental updates ---
+
+def record_issue_created(issue):
+    category_id, location_id = _keys(issue)
+    _upsert(IssueDailyCount,
+            {'day': issue.created_at.date(), 'category_id': category_id, 'location_id': location_id},
+            {'created_count': 1, 'resolved_count': 0})
+
+
+def apply_issue_changes(changes):
+    """Adjust the rollups for a batch of updated issues, one upsert per table.
+
+    `changes` holds rows with created_at, location_id and the old/new values of
+    category_id and resolved_at (old_category_id, old_resolved_at, ...).
+    """
+    counts = {}
+    histogram = {}
+
+    def add_count(day, category_id, location_id, column, delta):
+        key = (day, category_id or 0, location_id or 0)
+        row = counts.setdefault(key, {'created_count': 0, 'resolved_count': 0})
+        row[column] += delta
+
+    def add_resolution(created_at, resolved_at, category_id, location_id, delta):
+        add_count(resolved_at.date(), category_id, location_id, 'resolved_count', delta)
+        hours = (resolved_at - created_at).total_seconds() / 3600
+        key = (resolved_at.date(), category_id or 0, location_id or 0, resolution_bucket(hours))
+        histogram[key] = histogram.get(key, 0) + delta
+
+    for row in changes:
+        if row.old_category_id != row.category_id:
+            add_count(row.created_at.date(), row.old_category_id, row.location_id, 'created_count', -1)
+            add_count(row.created_at.date(), row.category_id, row.location_id, 'created_count', 1)
+        if (row.old_category_id, row.old_resolved_at) != (row.category_id, row.resolved_at):
+            if row.old_resolved_at is not None:
+                add_resolution(row.created_at, row.old_resolved_at, row.old_category_id, row.location_id, -1)
+            if row.resolved_at is not None:
+                add_resolution(row.created_at, row.resolved_at, row.category_id, row.location_id, 1)
+
+    count_rows = [
+        {'day': day, 'category_id': category_id, 'location_id': location_id, **deltas}
+        for (day, category_id, location_id), deltas in counts.items()
+        if deltas['created_count'] or deltas['resolved_count']
+    ]
+    if count_rows:
+        stmt = insert(IssueDailyCount.__table__).values(count_rows)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['day', 'category_id', 'location_id'],
+            set_={
+                'created_count': IssueDailyCount.__table__.c.created_count + stmt.excluded.created_count,
+                'resolved_count': IssueDailyCount.__table__.c.resolved_count + stmt.excluded.resolved_count
+            }
+        ))
+
+    histogram_rows = [
+        {'day': day, 'category_id': category_id, 'location_id': location_id, 'bucket': bucket, 'count': delta}
+        for (day, category_id, location_id, bucket), delta in histogram.items()
+        if delta
+    ]
+    if histogram_rows:
+        stmt = insert(ResolutionHistogram.__table__).values(histogram_rows)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=['day', 'category_id', 'location_id', 'bucket'],
+            set_={'count': ResolutionHistogram.__table__.c['count'] + stmt.excluded['count']}
+        ))
+
+
+# --- Bulk rebuild ---
+
+def rebuild_rollups():
+    """Recompute both rollup tables from the issues table with set-based statements"""
+    category = func.coalesce(Issue.category_id, 0)
+    location = func.coalesce(Issue.location_id, 0)
+
+    db.session.execute(db.delete(IssueDailyCount))
+    db.session.execute(db.delete(ResolutionHistogram))
+
+    created_day = func.date(Issue.created_at)
+    created = db.select(
+        created_day.label('day'), category.label('category_id'), location.label('location_id'),
+        func.count().label('created_count'), db.literal(0).label('resolved_count')
+    ).group_by(created_day, category, location)
+    db.session.execute(insert(IssueDailyCount.__table__).from_select(
+        ['day', 'category_id', 'location_id', 'created_count', 'resolved_count'], created))
+
+    resolved_day = func.date(Issue.resolved_at)
+    resolved = db.select(
+        resolved_day.label('day'), category.label('category_id'), location.label('location_id'),
+        db.literal(0).label('created_count'), func.count().label('resolved_count')
+    ).where(Issue.resolved_at.isnot(None)).group_by(resolved_day, category, location)
+    stmt = insert(IssueDailyCount.__table__).from_select(
+        ['day', 'category_id', 'location_id', 'created_count', 'resolved_count'], resolved)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=['day', 'category_id', 'location_id'],
+        set_={'resolved_count': stmt.excluded.resolved_count}
+    ))
+
+    # Same bucketing as resolution_bucket(), in SQL
+    hours = func.extract('epoch', Issue.resolved_at - Issue.created_at) / 3600.0
+    bucket = func.least(
+        NUM_BUCKETS - 1,
+        func.floor(BUCKETS_PER_DOUBLING * func.ln(func.greatest(hours / BASE_HOURS, 1)) / math.log(2))
+    ).cast(db.SmallInteger)
+    histogram = db.select(
+        resolved_day.label('day'), category.label('category_id'), location.label('location_id'),
+        bucket.label('bucket'), func.count().label('count')
+    ).where(Issue.resolved_at.isnot(None)).group_by(resolved_day, category, location, bucket)
+    db.session.execute(insert(ResolutionHistogram.__table__).from_select(
+        ['day', 'category_id', 'location_id', 'bucket', 'count'], histogram))
+
+    db.session.commit()
+
+
+# --- Queries ---
+
+def location_subtree_ids(location_id):
+    """A location and all of its descendants (province -> cities -> districts)"""
+    ids = [location_id]
+    frontier = [location_id]
+    while frontier:
+        frontier = [row[0] for row in db.session.query(Location.id).filter(Location.parent_id.in_(frontier)).all()]
+        frontier = [child for child in frontier if child not in ids]
+        ids.extend(frontier)
+    return ids
+
+
+def _filtered(query, model, since, category_id=None, location_id=None):
+    query = query.filter(model.day >= since)
+    if category_id is not None:
+        query = query.filter(model.category_id == category_id)
+    if location_id is not None:
+        query = query.filter(model.location_id.in_(location_subtree_ids(location_id)))
+    return query
+
+
+def trend_series(days, category_id=None, location_id=None, group_by=None):
+    """Daily created/resolved counts for each of the last `days` days (zero-filled), optionally split by category or location"""
+    since = (datetime.utcnow() - timedelta(days=days - 1)).date()
+    columns = [IssueDailyCount.day]
+    if group_by == 'category':
+        columns.append(IssueDailyCount.category_id)
+    elif group_by == 'location':
+        columns.append(IssueDailyCount.location_id)
+
+    query = db.session.query(
+        *columns,
+        func.sum(IssueDailyCount.created_count),
+        func.sum(IssueDailyCount.resolved_count)
+    )
+    query = _filtered(query, IssueDailyCount, since, category_id, location_id)
+    rows = query.group_by(*columns).order_by(IssueDailyCount.day).all()
+
+    counts = {}
+    for row in rows:
+        key = row[1] if group_by in ('category', 'location') else 'all'
+        counts.setdefault(key, {})[row[0]] = (int(row[-2] or 0), int(row[-1] or 0))
+    if group_by not in ('category', 'location'):
+        counts.setdefault('all', {})
+
+    # One point per day in [since, today], zero where there is no rollup row
+    dates = [since + timedelta(days=offset) for offset in range(days)]
+    series = {}
+    for key, by_day in counts.items():
+        series[key] = [{
+            'date': day.isoformat(),
+            'created': by_day.get(day, (0, 0))[0],
+            'resolved': by_day.get(day, (0, 0))[1]
+        } for day in dates]
+    return since, series
+
+
+def resolution_percentiles(days, percentiles, category_id=None, location_id=None):
+    """Time-to-resolve percentiles (hours) for issues resolved in the last `days` days"""
+    since = (datetime.utcnow() - timedelta(days=days - 1)).date()
+    query = db.session.query(ResolutionHistogram.bucket, func.sum(ResolutionHistogram.count))
+    query = _filtered(query, ResolutionHistogram, since, category_id, location_id)
+    # Buckets can go negative when apply_issue_changes() decrements issues resolved
+    # before the rollups existed; count those as empty both in the total and the scan
+    counts = {bucket: max(int(count or 0), 0) for bucket, count in query.group_by(ResolutionHistogram.bucket).all()}
+
+    total = sum(counts.values())
+    result = {}
+    for pct in percentiles:
+        result[f'p{pct:g}'] = None
+        if not total:
+            continue
+        target = pct / 100.0 * total
+        running = 0
+        for bucket in sorted(counts):
+            running += counts[bucket]
+            if running >= target:
+                result[f'p{pct:g}'] = round(bucket_midpoint_hours(bucket), 2)
+                break
+    return since, total, result
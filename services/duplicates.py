@@ -0,0 +1,184 @@
+import math
+import re
+import threading
+from collections import OrderedDict
+from sqlalchemy import func
+from models.models import db, Issue
+from services.maintenance import update_issues_in_batches
+
+# Near-duplicate detection for new reports.
+#
+# Spatial side: every issue stores a grid cell id (issues.geo_cell) computed from
+# its latitude/longitude when it is created. Candidates are the open issues of the
+# same category in the cells around the new report, fetched through the
+# (category_id, geo_cell) index - no scan over the issues table.
+#
+# Text side: titles and descriptions are compared by character trigram Jaccard
+# similarity. Trigram sets are cached per issue (LRU), so a neighbourhood that is
+# checked repeatedly is only tokenized once.
+
+CELL_DEGREES = 0.005  # ~550m of latitude per cell
+CELL_COLUMNS = int(math.ceil(360 / CELL_DEGREES))
+METERS_PER_DEGREE = 111320
+
+DUPLICATE_RADIUS_METERS = 300
+DUPLICATE_MIN_SIMILARITY = 0.35
+DUPLICATE_MAX_RESULTS = 5
+MAX_NEIGHBOURS = 500  # most recent candidates considered per lookup
+OPEN_STATUSES = ('open', 'in_progress')
+
+TRIGRAM_CACHE_SIZE = 50000
+
+
+def geo_cell_for(latitude, longitude):
+    """Grid cell id for a coordinate, or None if the issue has no coordinates"""
+    if latitude is None or longitude is None:
+        return None
+    row = int(math.floor((latitude + 90) / CELL_DEGREES))
+    col = int(math.floor((longitude + 180) / CELL_DEGREES))
+    return row * CELL_COLUMNS + col
+
+
+def geo_cell_expression():
+    """Same cell id as geo_cell_for(), as SQL - for backfilling existing rows"""
+    row = func.floor((Issue.latitude + 90) / CELL_DEGREES)
+    col = func.floor((Issue.longitude + 180) / CELL_DEGREES)
+    return db.cast(row * CELL_COLUMNS + col, db.BigInteger)
+
+
+def neighbouring_cells(latitude, longitude, radius_meters=DUPLICATE_RADIUS_METERS):
+    """All cells that may hold a point within radius_meters of the coordinate"""
+    row = int(math.floor((latitude + 90) / CELL_DEGREES))
+    col = int(math.floor((longitude + 180) / CELL_DEGREES))
+    cell_height = CELL_DEGREES * METERS_PER_DEGREE
+    # Longitude cells get narrower away from the equator
+    cell_width = max(cell_height * math.cos(math.radians(latitude)), 1.0)
+    row_span = int(math.ceil(radius_meters / cell_height))
+    col_span = int(math.ceil(radius_meters / cell_width))
+    return [
+        (row + dr) * CELL_COLUMNS + ((col + dc) % CELL_COLUMNS)
+        for dr in range(-row_span, row_span + 1)
+        for dc in range(-col_span, col_span + 1)
+    ]
+
+
+def distance_meters(lat1, lng1, lat2, lng2):
+    """Haversine distance between two coordinates"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * 6371000 * math.asin(math.sqrt(a))
+
+
+def trigrams(text):
+    normalized = ' ' + re.sub(r'[^a-z0-9]+', ' ', (text or '').lower()).strip() + ' '
+    if len(normalized) < 3:
+        return frozenset()
+    return frozenset(normalized[i:i + 3] for i in range(len(normalized) - 2))
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TrigramCache:
+    """Thread-safe LRU of (title trigrams, full-text trigrams) per issue"""
+
+    def __init__(self, max_size=TRIGRAM_CACHE_SIZE):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, issue_id, title, description):
+        key = (issue_id, hash(title), hash(description))
+        with self._lock:
+            cached = self._items.get(issue_id)
+            if cached and cached[0] == key:
+                self._items.move_to_end(issue_id)
+                return cached[1]
+        value = (trigrams(title), trigrams(f'{title} {description}'))
+        with self._lock:
+            self._items[issue_id] = (key, value)
+            self._items.move_to_end(issue_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return value
+
+
+trigram_cache = TrigramCache()
+
+
+def text_similarity(title_a, full_a, title_b, full_b):
+    # Titles are short and decisive, descriptions add context; weigh them equally
+    return 0.5 * jaccard(title_a, title_b) + 0.5 * jaccard(full_a, full_b)
+
+
+def find_duplicates(title, description, category_id, latitude=None, longitude=None, location_id=None,
+                    exclude_id=None, limit=DUPLICATE_MAX_RESULTS):
+    """Open issues in the same category that are close by and read alike, best match first"""
+    if not category_id:
+        return []
+
+    query = db.session.query(
+        Issue.id, Issue.title, Issue.description, Issue.latitude, Issue.longitude, Issue.created_at
+    ).filter(
+        Issue.category_id == category_id,
+        Issue.status.in_(OPEN_STATUSES)
+    )
+
+    has_coordinates = latitude is not None and longitude is not None
+    if has_coordinates:
+        query = query.filter(Issue.geo_cell.in_(neighbouring_cells(latitude, longitude)))
+    elif location_id:
+        # No coordinates: fall back to the same location (district)
+        query = query.filter(Issue.location_id == location_id)
+    else:
+        return []
+
+    if exclude_id:
+        query = query.filter(Issue.id != exclude_id)
+
+    neighbours = query.order_by(Issue.created_at.desc()).limit(MAX_NEIGHBOURS).all()
+    if not neighbours:
+        return []
+
+    new_title = trigrams(title)
+    new_full = trigrams(f'{title} {description}')
+
+    candidates = []
+    for issue_id, other_title, other_description, other_lat, other_lng, created_at in neighbours:
+        distance = None
+        if has_coordinates and other_lat is not None and other_lng is not None:
+            distance = distance_meters(latitude, longitude, other_lat, other_lng)
+            if distance > DUPLICATE_RADIUS_METERS:
+                continue
+
+        other_title_grams, other_full_grams = trigram_cache.get(issue_id, other_title, other_description)
+        similarity = text_similarity(new_title, new_full, other_title_grams, other_full_grams)
+        if similarity < DUPLICATE_MIN_SIMILARITY:
+            continue
+
+        # Closer reports rank higher at equal similarity
+        proximity = 1 - 0.5 * (distance / DUPLICATE_RADIUS_METERS) if distance is not None else 0.75
+        candidates.append({
+            'issue_id': issue_id,
+            'title': other_title,
+            'similarity': round(similarity, 3),
+            'distance_m': round(distance, 1) if distance is not None else None,
+            'score': round(similarity * proximity, 3),
+            'created_at': created_at.isoformat() if created_at else None
+        })
+
+    candidates.sort(key=lambda candidate: candidate['score'], reverse=True)
+    return candidates[:limit]
+
+
+def backfill_geo_cells():
+    """Set geo_cell for issues that have coordinates but no cell yet, in id-range batches; keeps updated_at"""
+    return update_issues_in_batches(
+        {'geo_cell': geo_cell_expression()},
+        Issue.geo_cell.is_(None), Issue.latitude.isnot(None), Issue.longitude.isnot(None)
+    )
@@ -0,0 +1,249 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections import defaultdict
+
+# Live update fan-out for the SSE endpoints in routes/events_api.py.
+#
+# Write paths call publish() after their transaction commits. With the default
+# 'memory' backend the event goes straight to this process's subscribers. With the
+# 'postgres' backend it is sent through NOTIFY and every worker's listener thread
+# (LISTEN on the same channel) hands it to its own local subscribers, so clients
+# connected to any worker see writes made on any other.
+
+PG_CHANNEL = 'sunoaid_events'
+PG_NOTIFY_MAX_BYTES = 7900  # NOTIFY payloads must stay under 8000 bytes
+SUBSCRIBER_QUEUE_SIZE = 100  # events buffered per client before it is treated as too slow
+FEED_CHANNEL = 'feed'
+COMMENT_PREVIEW_CHARS = 280  # comment content sent with 'comment' events
+FEED_STATUS_BATCH = 50  # status changes per feed 'statuses' event (~90 bytes each)
+
+logger = logging.getLogger(__name__)
+
+
+def issue_channel(issue_id):
+    return f'issue:{issue_id}'
+
+
+class EventBroker:
+    """In-process pub/sub: one bounded queue per connected SSE client"""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+        self._app = None
+        self._backend = 'memory'
+        self._listener = None
+
+    def init_app(self, app):
+        self._app = app
+        self._backend = app.config.get('EVENTS_BACKEND', 'memory')
+        if self._backend not in ('memory', 'postgres'):
+            raise ValueError(f"Unknown EVENTS_BACKEND: {self._backend}")
+
+    # --- subscribers ---
+
+    def subscribe(self, channel):
+        if self._backend == 'postgres':
+            self._ensure_listener()
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[channel].add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def dispatch(self, channel, message):
+        """Deliver a message to this process's subscribers; never blocks the caller"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                # Slow client: drop it, the stream will close and the browser reconnects
+                self.unsubscribe(channel, subscriber)
+                self._close(subscriber)
+
+    @staticmethod
+    def _close(subscriber):
+        while True:
+            try:
+                subscriber.get_nowait()
+            except queue.Empty:
+                break
+        subscriber.put_nowait(None)
+
+    # --- publishing ---
+
+    def publish(self, channels, event, data):
+        """Publish an event to one or more channels. Call after the write has committed."""
+        self.publish_many([(channels, event, data)])
+
+    def publish_many(self, events):
+        """Publish a batch of (channels, event, data) with a single NOTIFY round trip in postgres mode"""
+        messages = [{'channels': list(channels), 'event': event, 'data': data} for channels, event, data in events]
+        if not messages:
+            return
+        try:
+            if self._backend == 'postgres':
+                self._notify(messages)
+            else:
+                for message in messages:
+                    self._deliver(message)
+        except Exception as e:
+            # Live updates are best effort; the write itself has already committed
+            logger.warning("Failed to publish %s event(s): %s", len(messages), e)
+            if self._backend == 'postgres':
+                from models.models import db
+                db.session.rollback()
+
+    def _deliver(self, message):
+        payload = json.dumps(message['data'], separators=(',', ':'))
+        for channel in message['channels']:
+            self.dispatch(channel, (message['event'], payload))
+
+    @staticmethod
+    def _pack(messages):
+        """Group messages into JSON arrays that each fit in one NOTIFY payload"""
+        payloads = []
+        batch = []
+        size = 2
+        for message in messages:
+            # ensure_ascii (the default) keeps len() equal to the byte size
+            encoded = json.dumps(message, separators=(',', ':'))
+            if len(encoded) + 2 > PG_NOTIFY_MAX_BYTES:
+                logger.warning("Dropping oversized %s event", message['event'], extra={'bytes': len(encoded)})
+                continue
+            if batch and size + len(encoded) + 1 > PG_NOTIFY_MAX_BYTES:
+                payloads.append('[' + ','.join(batch) + ']')
+                batch = []
+                size = 2
+            batch.append(encoded)
+            size += len(encoded) + 1
+        if batch:
+            payloads.append('[' + ','.join(batch) + ']')
+        return payloads
+
+    def _notify(self, messages):
+        from models.models import db
+        payloads = self._pack(messages)
+        if not payloads:
+            return
+        db.session.execute(
+            db.text('SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload'),
+            {'channel': PG_CHANNEL, 'payloads': payloads}
+        )
+        db.session.commit()
+
+    # --- postgres listener ---
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen_forever, name='event-listener', daemon=True)
+                self._listener.start()
+
+    def _connect(self):
+        import psycopg2
+        from models.models import db
+
+        with self._app.app_context():
+            url = db.engine.url
+        conn = psycopg2.connect(**url.translate_connect_args(username='user', database='dbname'), **url.query)
+        conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN {PG_CHANNEL}')
+        return conn
+
+    def _listen_forever(self):
+        backoff = 1
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                backoff = 1
+                while True:
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        for message in json.loads(notify.payload):
+                            self._deliver(message)
+            except Exception as e:
+                logger.warning("Event listener disconnected: %s; retrying in %ss", e, backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+
+broker = EventBroker()
+
+
+# --- Event helpers used by the write paths ---
+
+def publish_vote(issue):
+    broker.publish([issue_channel(issue.id), FEED_CHANNEL], 'vote', {
+        'issue_id': issue.id,
+        'upvotes': issue.upvotes,
+        'downvotes': issue.downvotes,
+    })
+
+
+def publish_comment(issue, comment):
+    """Compact delta: ids, author name and a content preview; clients fetch the full comment if truncated"""
+    content = comment.content or ''
+    broker.publish([issue_channel(issue.id), FEED_CHANNEL], 'comment', {
+        'issue_id': issue.id,
+        'comments_count': issue.comments_count,
+        'comment': {
+            'id': comment.id,
+            'parent_id': comment.parent_id,
+            'created_at': comment.created_at.isoformat() if comment.created_at else None,
+            'user_id': comment.user_id,
+            'user_name': comment.user.name if comment.user else None,
+            'content': content[:COMMENT_PREVIEW_CHARS],
+            'content_truncated': len(content) > COMMENT_PREVIEW_CHARS,
+        },
+    })
+
+
+def publish_statuses(issues):
+    """Status events for a batch of updated issues (e.g. bulk moderation).
+
+    Each issue's own channel gets its usual 'status' event; the feed gets 'statuses'
+    events listing up to FEED_STATUS_BATCH changes each. Everything goes out in one
+    publish_many() call, i.e. one NOTIFY statement in postgres mode.
+    """
+    changes = [{
+        'issue_id': issue.id,
+        'status': issue.status,
+        'resolved_at': issue.resolved_at.isoformat() if issue.resolved_at else None,
+    } for issue in issues]
+    if not changes:
+        return
+    events = [([issue_channel(change['issue_id'])], 'status', change) for change in changes]
+    for start in range(0, len(changes), FEED_STATUS_BATCH):
+        events.append(([FEED_CHANNEL], 'statuses', {'issues': changes[start:start + FEED_STATUS_BATCH]}))
+    broker.publish_many(events)
+
+
+def publish_issue_created(issue):
+    broker.publish([FEED_CHANNEL], 'issue', {
+        'issue_id': issue.id,
+        'title': issue.title,
+        'category_id': issue.category_id,
+        'location_id': issue.location_id,
+    })
@@ -0,0 +1,231 @@
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from models.models import db, Job
+
+# Durable background jobs stored in the jobs table.
+#
+# Request handlers call enqueue() inside their own transaction, so a job exists
+# exactly when the write that caused it commits. A worker process
+# ('flask --app app run-worker') claims due jobs with SELECT ... FOR UPDATE SKIP
+# LOCKED, so several workers can run side by side without taking the same job.
+#
+# Handlers are registered per kind and receive a *group* of jobs: every due job
+# of that kind with the same key (e.g. all pending notifications for one user).
+# Groups are claimed whole, so a digest is never split across batches or workers.
+# Completed jobs are purged after DONE_JOB_RETENTION.
+# If a handler raises, the whole group is retried with exponential backoff until
+# max_attempts, then marked 'failed'.
+
+logger = logging.getLogger(__name__)
+
+CLAIM_BATCH_SIZE = 100
+POLL_INTERVAL_SECONDS = 2
+RETRY_BASE_SECONDS = 30
+LOCK_TIMEOUT = timedelta(minutes=10)  # running jobs older than this are assumed lost and requeued
+DONE_JOB_RETENTION = timedelta(days=7)  # completed jobs are deleted after this
+PURGE_BATCH_SIZE = 5000
+
+_handlers = {}
+
+
+def job_handler(kind):
+    """Register a function handling a list of jobs of `kind` that share a key"""
+    def register(fn):
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(kind, payload, key=None, run_at=None, max_attempts=5):
+    """Add a job to the current transaction; it becomes visible to workers on commit"""
+    job = Job(kind=kind, key=key, payload=payload, run_at=run_at or datetime.utcnow(),
+              max_attempts=max_attempts)
+    db.session.add(job)
+    return job
+
+
+def enqueue_many(kind, jobs, max_attempts=5):
+    """Bulk version of enqueue() for (payload, key, run_at) tuples: one multi-row INSERT"""
+    if not jobs:
+        return
+    now = datetime.utcnow()
+    db.session.execute(Job.__table__.insert(), [{
+        'kind': kind,
+        'key': key,
+        'payload': payload,
+        'status': 'pending',
+        'attempts': 0,
+        'max_attempts': max_attempts,
+        'run_at': run_at or now,
+        'created_at': now
+    } for payload, key, run_at in jobs])
+
+
+def pending_run_at(kind, key):
+    """run_at of the earliest pending job of this kind and key, if any (used to join a digest)"""
+    return db.session.query(db.func.min(Job.run_at)).filter(
+        Job.kind == kind, Job.key == key, Job.status == 'pending'
+    ).scalar()
+
+
+def pending_run_at_by_key(kind, keys):
+    """pending_run_at() for many keys in one query; keys without pending jobs are left out"""
+    if not keys:
+        return {}
+    return dict(db.session.query(Job.key, db.func.min(Job.run_at)).filter(
+        Job.kind == kind, Job.key.in_(list(keys)), Job.status == 'pending'
+    ).group_by(Job.key).all())
+
+
+def _group_key():
+    """SQL for the key run_jobs() groups by: the job's key, or a per-job key when it has none"""
+    return db.func.coalesce(Job.key, db.func.concat('job:', Job.id))
+
+
+def claim_jobs(worker_id, limit=CLAIM_BATCH_SIZE):
+    """Claim every due job of up to `limit` (kind, key) groups, so a group is never split.
+
+    Each group is taken under a transaction-level advisory lock; groups another
+    worker is claiming at the same moment are skipped rather than shared.
+    """
+    now = datetime.utcnow()
+    group_key = _group_key()
+    due = db.session.query(
+        Job.kind.label('kind'), group_key.label('group_key')
+    ).filter(
+        Job.status == 'pending',
+        Job.run_at <= now
+    ).group_by(Job.kind, group_key).order_by(db.func.min(Job.run_at)).limit(limit).subquery()
+    groups = db.session.query(due.c.kind, due.c.group_key).filter(
+        db.func.pg_try_advisory_xact_lock(db.func.hashtext(due.c.kind), db.func.hashtext(due.c.group_key))
+    ).all()
+    if not groups:
+        db.session.commit()
+        return []
+
+    jobs = Job.query.filter(
+        Job.status == 'pending',
+        Job.run_at <= now,
+        db.tuple_(Job.kind, group_key).in_([tuple(group) for group in groups])
+    ).order_by(Job.run_at).with_for_update(skip_locked=True).all()
+
+    for job in jobs:
+        job.status = 'running'
+        job.locked_at = now
+        job.locked_by = worker_id
+        job.attempts += 1
+    db.session.commit()
+    return jobs
+
+
+def requeue_stale_jobs():
+    """Put back jobs whose worker died while running them; fail those that have used up their attempts"""
+    now = datetime.utcnow()
+    cutoff = now - LOCK_TIMEOUT
+    stale = (Job.status == 'running', Job.locked_at < cutoff)
+    failed = Job.query.filter(*stale, Job.attempts >= Job.max_attempts).update({
+        'status': 'failed', 'locked_at': None, 'locked_by': None, 'finished_at': now,
+        'last_error': f'Still running after {LOCK_TIMEOUT}; worker lost or handler hung'
+    }, synchronize_session=False)
+    count = Job.query.filter(*stale).update(
+        {'status': 'pending', 'locked_at': None, 'locked_by': None}, synchronize_session=False
+    )
+    db.session.commit()
+    if count:
+        logger.warning("Requeued stale jobs", extra={'count': count})
+    if failed:
+        logger.error("Failed stale jobs after max attempts", extra={'count': failed})
+    return count
+
+
+def purge_finished_jobs():
+    """Delete 'done' jobs older than DONE_JOB_RETENTION, in batches; 'failed' jobs are kept for inspection"""
+    cutoff = datetime.utcnow() - DONE_JOB_RETENTION
+    purged = 0
+    while True:
+        batch = db.select(Job.id).where(
+            Job.status == 'done', Job.finished_at < cutoff
+        ).limit(PURGE_BATCH_SIZE).scalar_subquery()
+        count = db.session.execute(
+            db.delete(Job).where(Job.id.in_(batch)).execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.commit()
+        purged += count
+        if count < PURGE_BATCH_SIZE:
+            break
+    if purged:
+        logger.info("Purged finished jobs", extra={'count': purged})
+    return purged
+
+
+def _finish(jobs, error=None):
+    now = datetime.utcnow()
+    for job in jobs:
+        job.locked_at = None
+        job.locked_by = None
+        if error is None:
+            job.status = 'done'
+            job.finished_at = now
+            job.last_error = None
+        elif job.attempts >= job.max_attempts:
+            job.status = 'failed'
+            job.finished_at = now
+            job.last_error = error
+        else:
+            job.status = 'pending'
+            job.run_at = now + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (job.attempts - 1))
+            job.last_error = error
+    db.session.commit()
+
+
+def run_jobs(jobs):
+    """Run claimed jobs grouped by (kind, key); returns (succeeded, failed) job counts"""
+    groups = defaultdict(list)
+    for job in jobs:
+        groups[(job.kind, job.key or f'job:{job.id}')].append(job)
+
+    succeeded = failed = 0
+    for (kind, key), group in groups.items():
+        handler = _handlers.get(kind)
+        if handler is None:
+            _finish(group, error=f'No handler for job kind {kind!r}')
+            failed += len(group)
+            continue
+        try:
+            handler(group)
+        except Exception as e:
+            db.session.rollback()
+            logger.exception("Job group failed", extra={'kind': kind, 'key': key, 'jobs': len(group)})
+            _finish(group, error=str(e))
+            failed += len(group)
+        else:
+            _finish(group)
+            succeeded += len(group)
+    return succeeded, failed
+
+
+def run_worker(once=False):
+    """Claim and run jobs until interrupted (or until the queue is empty with once=True)"""
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    logger.info("Job worker started", extra={'worker': worker_id})
+    last_stale_check = 0.0
+
+    while True:
+        if time.monotonic() - last_stale_check > LOCK_TIMEOUT.total_seconds() / 2:
+            requeue_stale_jobs()
+            purge_finished_jobs()
+            last_stale_check = time.monotonic()
+
+        jobs = claim_jobs(worker_id)
+        if jobs:
+            succeeded, failed = run_jobs(jobs)
+            logger.info("Processed jobs", extra={'succeeded': succeeded, 'failed': failed})
+            continue
+
+        if once:
+            return
+        time.sleep(POLL_INTERVAL_SECONDS)
@@ -0,0 +1,33 @@
+from sqlalchemy import func
+from models.models import db, Issue
+
+# Backfills over the issues table (hot scores, geo cells).
+#
+# They run in id-range batches, one transaction each, so a million-row backfill
+# never holds one huge transaction or lock set. They also leave updated_at alone:
+# the model's onupdate is overridden by assigning the column to itself, and the
+# update_issues_updated_at trigger skips rows while the transaction-local
+# setting sunoaid.preserve_updated_at is 'on' (see database_schema.sql).
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def update_issues_in_batches(values, *conditions, batch_size=BACKFILL_BATCH_SIZE):
+    """UPDATE issues SET values WHERE conditions, batch_size ids at a time; returns rows updated"""
+    min_id, max_id = db.session.query(func.min(Issue.id), func.max(Issue.id)).filter(*conditions).one()
+    if min_id is None:
+        db.session.commit()
+        return 0
+
+    updated = 0
+    for start in range(min_id, max_id + 1, batch_size):
+        db.session.execute(db.text("SELECT set_config('sunoaid.preserve_updated_at', 'on', true)"))
+        result = db.session.execute(
+            db.update(Issue)
+            .where(Issue.id >= start, Issue.id < start + batch_size, *conditions)
+            .values(updated_at=Issue.updated_at, **values)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        updated += result.rowcount
+    return updated
@@ -0,0 +1,131 @@
+from datetime import datetime
+from sqlalchemy import func, or_
+from models.models import db, Issue
+from services.analytics import apply_issue_changes
+from services.events import publish_statuses
+from services.notifications import notify_status_changes
+from services.ranking import hot_score_expression
+
+# Bulk moderation: one set-based UPDATE over the selected issues, with every
+# derived value (resolved_at, hot scores, analytics rollups, notifications)
+# adjusted in the same transaction.
+
+VALID_STATUSES = ('open', 'in_progress', 'resolved', 'closed')
+RESOLVED_STATUSES = ('resolved', 'closed')
+VALID_SEVERITIES = ('low', 'medium', 'high', 'critical')
+
+MAX_BULK_ISSUES = 5000
+
+# Keys accepted in a request's "filters" and "set"; anything else is rejected, since
+# a silently ignored (e.g. misspelt) filter would widen a destructive update
+FILTER_FIELDS = ('status', 'category_id', 'location_id', 'severity', 'created_after', 'created_before')
+SET_FIELDS = ('status', 'category_id', 'severity')
+
+
+class BulkModerationError(ValueError):
+    pass
+
+
+def filter_conditions(target, issue_ids=None, filters=None):
+    """WHERE clauses on `target` (Issue or an alias) for an ID list and/or filters; at least one is required"""
+    filters = filters or {}
+    unknown = sorted(set(filters) - set(FILTER_FIELDS))
+    if unknown:
+        raise BulkModerationError(f"Unknown filter(s): {', '.join(unknown)}")
+    conditions = []
+    if issue_ids:
+        conditions.append(target.id.in_(issue_ids))
+    if filters.get('status'):
+        conditions.append(target.status == filters['status'])
+    if filters.get('category_id'):
+        conditions.append(target.category_id == filters['category_id'])
+    if filters.get('location_id'):
+        conditions.append(target.location_id == filters['location_id'])
+    if filters.get('severity'):
+        conditions.append(target.severity == filters['severity'])
+    if filters.get('created_after'):
+        conditions.append(target.created_at >= filters['created_after'])
+    if filters.get('created_before'):
+        conditions.append(target.created_at < filters['created_before'])
+    if not conditions:
+        raise BulkModerationError('Provide issue_ids or at least one filter')
+    return conditions
+
+
+def bulk_update_issues(issue_ids=None, filters=None, status=None, category_id=None, severity=None):
+    """Apply the changes to every matching issue that they actually change; returns the updated rows"""
+    now = datetime.utcnow()
+    current = db.aliased(Issue, name='current')
+    conditions = filter_conditions(current, issue_ids=issue_ids, filters=filters)
+    values = {'updated_at': now}
+    changed = []
+
+    if status is not None:
+        values['status'] = status
+        # Keep an existing resolved_at when moving between resolved and closed
+        values['resolved_at'] = func.coalesce(Issue.resolved_at, now) if status in RESOLVED_STATUSES else None
+        changed.append(current.status.is_distinct_from(status))
+    if category_id is not None:
+        values['category_id'] = category_id
+        changed.append(current.category_id.is_distinct_from(category_id))
+    if severity is not None:
+        values['severity'] = severity
+        changed.append(current.severity.is_distinct_from(severity))
+    if not changed:
+        raise BulkModerationError('Nothing to change: set status, category_id or severity')
+
+    # Old values, locked, so RETURNING can report both sides of each change
+    old = db.select(
+        current.id.label('id'),
+        current.status.label('old_status'),
+        current.category_id.label('old_category_id'),
+        current.severity.label('old_severity'),
+        current.resolved_at.label('old_resolved_at')
+    ).where(*conditions, or_(*changed)).limit(MAX_BULK_ISSUES + 1).with_for_update().subquery('old')
+
+    stmt = (
+        db.update(Issue)
+        .where(Issue.id == old.c.id)
+        .values(**values)
+        .returning(
+            Issue.id, Issue.title, Issue.user_id, Issue.status, Issue.category_id, Issue.severity,
+            Issue.location_id, Issue.created_at, Issue.resolved_at,
+            old.c.old_status, old.c.old_category_id, old.c.old_severity, old.c.old_resolved_at
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = db.session.execute(stmt).all()
+
+    if len(rows) > MAX_BULK_ISSUES:
+        db.session.rollback()
+        raise BulkModerationError(f'More than {MAX_BULK_ISSUES} issues match; narrow the filters')
+
+    if rows:
+        # Severity is part of the hot score
+        reranked = [row.id for row in rows if row.old_severity != row.severity]
+        if reranked:
+            db.session.execute(
+                db.update(Issue)
+                .where(Issue.id.in_(reranked))
+                .values(hot_score=hot_score_expression())
+                .execution_options(synchronize_session=False)
+            )
+        apply_issue_changes(rows)
+        notify_status_changes([row for row in rows if row.old_status != row.status])
+
+    db.session.commit()
+
+    publish_statuses([row for row in rows if row.old_status != row.status])
+    return rows
+
+
+def row_to_dict(row):
+    return {
+        'id': row.id,
+        'title': row.title,
+        'status': row.status,
+        'previous_status': row.old_status,
+        'category_id': row.category_id,
+        'severity': row.severity,
+        'resolved_at': row.resolved_at.isoformat() if row.resolved_at else None
+    }
@@ -0,0 +1,102 @@
+import logging
+import socket
+from datetime import datetime, timedelta
+from flask import current_app
+from flask_mail import Mail, Message
+from models.models import User
+from services.jobs import enqueue, enqueue_many, job_handler, pending_run_at, pending_run_at_by_key
+
+# Email notifications for issue reporters, sent by the job worker.
+#
+# Each event (new comment, reply, status change) is enqueued as a 'notify' job
+# keyed by recipient. Jobs for the same recipient share a run_at, so everything that
+# happens within NOTIFY_DIGEST_SECONDS of the first event goes out as one email.
+
+logger = logging.getLogger(__name__)
+
+mail = Mail()
+
+NOTIFY_KIND = 'notify'
+
+
+def _default_run_at():
+    return datetime.utcnow() + timedelta(seconds=current_app.config.get('NOTIFY_DIGEST_SECONDS', 300))
+
+
+def _digest_run_at(key):
+    return pending_run_at(NOTIFY_KIND, key) or _default_run_at()
+
+
+def _payload(user_id, event, issue, **details):
+    return {
+        'user_id': user_id,
+        'event': event,
+        'issue_id': issue.id,
+        'issue_title': issue.title,
+        **details
+    }
+
+
+def notify_user(user_id, event, issue, **details):
+    """Queue a notification for a user in the current transaction"""
+    key = f'user:{user_id}'
+    enqueue(NOTIFY_KIND, _payload(user_id, event, issue, **details), key=key, run_at=_digest_run_at(key))
+
+
+def notify_comment(issue, comment, author):
+    """Tell the reporter about a new comment, and the parent comment's author about a reply"""
+    if issue.user_id != author.id:
+        notify_user(issue.user_id, 'comment', issue, author=author.name, content=comment.content[:200])
+    if comment.parent is not None and comment.parent.user_id not in (author.id, issue.user_id):
+        notify_user(comment.parent.user_id, 'reply', issue, author=author.name, content=comment.content[:200])
+
+
+def notify_status_changes(changes):
+    """Status-change notifications for rows with id, title, user_id, status and old_status.
+
+    Looks up every recipient's pending digest in one query and inserts all jobs in one statement.
+    """
+    keys = {f'user:{row.user_id}' for row in changes}
+    run_at_by_key = pending_run_at_by_key(NOTIFY_KIND, keys)
+    default_run_at = _default_run_at()
+    jobs = []
+    for row in changes:
+        key = f'user:{row.user_id}'
+        payload = _payload(row.user_id, 'status', row, old_status=row.old_status, new_status=row.status)
+        jobs.append((payload, key, run_at_by_key.get(key, default_run_at)))
+    enqueue_many(NOTIFY_KIND, jobs)
+
+
+def _describe(payload):
+    title = payload.get('issue_title')
+    if payload['event'] == 'comment':
+        return f"{payload.get('author')} commented on \"{title}\": {payload.get('content')}"
+    if payload['event'] == 'reply':
+        return f"{payload.get('author')} replied to your comment on \"{title}\": {payload.get('content')}"
+    if payload['event'] == 'status':
+        return f"\"{title}\" changed from {payload.get('old_status')} to {payload.get('new_status')}"
+    return f"Update on \"{title}\""
+
+
+@job_handler(NOTIFY_KIND)
+def send_notification_digest(jobs):
+    """One email per recipient covering every queued notification"""
+    user = User.query.get(jobs[0].payload['user_id'])
+    if user is None or not user.email:
+        logger.info("Skipping notifications for missing user", extra={'user_id': jobs[0].payload['user_id']})
+        return
+
+    lines = [_describe(job.payload) for job in sorted(jobs, key=lambda job: job.created_at or datetime.min)]
+    subject = 'SunoAid: update on your report' if len(lines) == 1 else f'SunoAid: {len(lines)} updates on your reports'
+    body = f"Hi {user.name},\n\n" + '\n'.join(f'- {line}' for line in lines) + "\n\n- The SunoAid team"
+
+    # Flask-Mail has no timeout option; smtplib picks up the socket default when it connects.
+    # Keep it well under LOCK_TIMEOUT so a hung SMTP server fails the job instead of
+    # leaving it 'running' until another worker requeues and re-sends it.
+    previous_timeout = socket.getdefaulttimeout()
+    socket.setdefaulttimeout(current_app.config.get('MAIL_TIMEOUT_SECONDS', 60))
+    try:
+        mail.send(Message(subject=subject, recipients=[user.email], body=body))
+    finally:
+        socket.setdefaulttimeout(previous_timeout)
+    logger.info("Sent notification digest", extra={'user_id': user.id, 'events': len(lines)})
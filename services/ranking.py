@@ -0,0 +1,59 @@
+from sqlalchemy import func, case
+from models.models import db, Issue
+from services.maintenance import update_issues_in_batches
+
+# Hot ranking, stored in issues.hot_score and served by idx_issues_hot_score.
+#
+#   hot = sign(net) * log10(max(|net|, 1))
+#       + severity boost
+#       + 0.5 * log10(1 + comments)
+#       + (created_at - epoch) / HOT_DECAY_SECONDS
+#
+# The age term is anchored to a fixed epoch instead of "now", so an issue's score
+# only changes when it gets votes or comments. Newer issues start higher and older
+# ones fall behind them without rewriting every row: 10x the votes buys an issue
+# HOT_DECAY_SECONDS (12.5 hours) of age.
+HOT_EPOCH = 1704067200  # 2024-01-01 00:00:00 UTC
+HOT_DECAY_SECONDS = 45000
+HOT_COMMENT_WEIGHT = 0.5
+
+SEVERITY_BOOST = {
+    'critical': 1.5,
+    'high': 1.0,
+    'medium': 0.5,
+    'low': 0.0,
+}
+
+
+def hot_score_expression():
+    """SQL expression computing the hot score from an issue row's current columns"""
+    net = func.coalesce(Issue.upvotes, 0) - func.coalesce(Issue.downvotes, 0)
+    votes = func.sign(net) * func.log(func.greatest(func.abs(net), 1))
+    severity = case(
+        *[(Issue.severity == name, boost) for name, boost in SEVERITY_BOOST.items()],
+        else_=SEVERITY_BOOST['medium']
+    )
+    comments = HOT_COMMENT_WEIGHT * func.log(1 + func.coalesce(Issue.comments_count, 0))
+    age = (func.extract('epoch', Issue.created_at) - HOT_EPOCH) / HOT_DECAY_SECONDS
+    return votes + severity + comments + age
+
+
+def refresh_hot_score(issue_id):
+    """Recompute one issue's hot score in the current transaction (call after the write is flushed)"""
+    db.session.flush()
+    db.session.execute(
+        db.update(Issue)
+        .where(Issue.id == issue_id)
+        .values(hot_score=hot_score_expression())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def refresh_all_hot_scores(since=None):
+    """Recompute hot scores in id-range batches; optionally only issues created after `since`.
+
+    Write paths keep scores current, so this is only needed to backfill existing
+    rows or after changing the weights above. updated_at is left unchanged.
+    """
+    conditions = [Issue.created_at >= since] if since is not None else []
+    return update_issues_in_batches({'hot_score': hot_score_expression()}, *conditions)